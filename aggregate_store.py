@@ -0,0 +1,190 @@
+import os
+import hashlib
+import joblib
+import streamlit as st
+import numpy as np
+import pandas as pd
+from data_loader import DATASET_HASH_FUNCS, iter_data_chunks
+from instrumentation import timed
+from streaming_stats import CoMoments, GroupedCounter, Moments, TDigest
+
+AGGREGATE_DIR = "artifacts"
+
+# Bump when DatasetAggregates changes shape so stale persisted aggregates are recomputed
+AGGREGATE_VERSION = 2
+
+# Sensitive attributes whose good-credit rate is tracked for the fairness page
+GROUP_ATTRIBUTES = ["personal_status", "employment"]
+
+class DatasetAggregates:
+    """
+    Dashboard summaries accumulated in a single pass over the data.
+
+    Holds the class counts, exact per-value counts of every integer column (from which histograms and
+    quantiles are derived), a t-digest for any other numeric column, mergeable moments for mean, std
+    and correlation, and good-rate counters per sensitive attribute. Nothing here depends on the
+    number of rows once computed, and aggregates of separate chunks or processes can be merged.
+    """
+
+    def __init__(self):
+        self.columns = None
+        self.class_counts = {}
+        self.value_offsets = {}
+        self.value_counts = {}
+        self.digests = {}
+        self.moments = Moments()
+        self.comoments = CoMoments()
+        self.good_rates = {attribute: GroupedCounter() for attribute in GROUP_ATTRIBUTES}
+
+    @property
+    def n(self):
+        return self.moments.n
+
+    def update(self, chunk):
+        if self.columns is None:
+            self.columns = list(chunk.select_dtypes(include=[np.number]).columns)
+
+        for label, count in chunk["class"].value_counts().items():
+            self.class_counts[label] = self.class_counts.get(label, 0) + int(count)
+
+        X = chunk[self.columns].to_numpy(dtype=np.float64)
+        self.moments.update(X)
+        self.comoments.update(X)
+
+        for col in self.columns:
+            values = chunk[col].to_numpy()
+            if np.issubdtype(values.dtype, np.integer):
+                values = values.astype(np.int64)
+                low = int(values.min())
+                self.add_value_counts(col, low, np.bincount(values - low))
+            else:
+                self.digests.setdefault(col, TDigest()).update(values)
+
+        good = (chunk["class"] == "good").to_numpy()
+        for attribute, counter in self.good_rates.items():
+            if attribute in chunk:
+                counter.update(chunk[attribute].to_numpy(), good)
+        return self
+
+    def merge(self, other):
+        if self.columns is None:
+            self.columns = other.columns
+        for label, count in other.class_counts.items():
+            self.class_counts[label] = self.class_counts.get(label, 0) + count
+        for col, counts in other.value_counts.items():
+            self.add_value_counts(col, other.value_offsets[col], counts)
+        for col, digest in other.digests.items():
+            self.digests.setdefault(col, TDigest()).merge(digest)
+        self.moments.merge(other.moments)
+        self.comoments.merge(other.comoments)
+        for attribute, counter in other.good_rates.items():
+            self.good_rates.setdefault(attribute, GroupedCounter()).merge(counter)
+        return self
+
+    def add_value_counts(self, col, low, counts):
+        if col not in self.value_counts:
+            self.value_offsets[col], self.value_counts[col] = low, counts
+            return
+        old_low, old_counts = self.value_offsets[col], self.value_counts[col]
+        new_low = min(low, old_low)
+        size = max(old_low + len(old_counts), low + len(counts)) - new_low
+        merged = np.zeros(size, dtype=np.int64)
+        merged[old_low - new_low:old_low - new_low + len(old_counts)] += old_counts
+        merged[low - new_low:low - new_low + len(counts)] += counts
+        self.value_offsets[col], self.value_counts[col] = new_low, merged
+
+    def values_and_counts(self, col):
+        counts = self.value_counts[col]
+        values = np.arange(len(counts)) + self.value_offsets[col]
+        present = counts > 0
+        return values[present], counts[present]
+
+    def histogram(self, col, bins=20):
+        """
+        For integer columns, the same counts and edges as np.histogram(column, bins) on the raw data;
+        other columns are binned from their t-digest centroids.
+        """
+        if col in self.value_counts:
+            values, counts = self.values_and_counts(col)
+            return np.histogram(values, bins=bins, range=(values[0], values[-1]), weights=counts)
+        digest = self.digests[col]
+        return np.histogram(digest.means, bins=bins, range=(digest.min, digest.max), weights=digest.weights)
+
+    def quantile(self, col, q):
+        if col not in self.value_counts:
+            return float(self.digests[col].quantile(q))
+        # Linear interpolation between order statistics, as in pandas/numpy
+        values, counts = self.values_and_counts(col)
+        cumulative = np.cumsum(counts)
+        position = q * (cumulative[-1] - 1)
+        lower = values[np.searchsorted(cumulative, np.floor(position), side="right")]
+        upper = values[np.searchsorted(cumulative, np.ceil(position), side="right")]
+        return lower + (upper - lower) * (position - np.floor(position))
+
+    def corr(self):
+        return pd.DataFrame(self.comoments.corr(), index=self.columns, columns=self.columns)
+
+    def describe(self):
+        """
+        Same layout as DataFrame.describe() on the numeric columns.
+        """
+        rows = {
+            "count": np.full(len(self.columns), float(self.n)),
+            "mean": self.moments.mean,
+            "std": self.moments.std(),
+            "min": self.moments.min,
+            "25%": [self.quantile(col, 0.25) for col in self.columns],
+            "50%": [self.quantile(col, 0.50) for col in self.columns],
+            "75%": [self.quantile(col, 0.75) for col in self.columns],
+            "max": self.moments.max,
+        }
+        return pd.DataFrame(rows, index=self.columns).T.astype(float)
+
+    def good_rate(self, attribute):
+        """
+        Share of 'good' outcomes per category of `attribute`, like data.groupby(attribute)["class_numeric"].mean().
+        """
+        return self.good_rates[attribute].rate()
+
+    def class_distribution(self):
+        return pd.Series(self.class_counts, name="count").sort_values(ascending=False)
+
+def compute_aggregates(chunks):
+    aggregates = DatasetAggregates()
+    for chunk in chunks:
+        aggregates.update(chunk)
+    return aggregates
+
+def aggregate_path(fingerprint, directory=AGGREGATE_DIR):
+    key = hashlib.sha256(f"{fingerprint}:{AGGREGATE_VERSION}".encode()).hexdigest()[:16]
+    return os.path.join(directory, f"aggregates_{key}.joblib")
+
+def load_or_compute_aggregates(dataset, chunksize=100_000, directory=AGGREGATE_DIR):
+    """
+    Return the aggregates for a DatasetHandle, computing and persisting them only when the dataset changes.
+    File-backed datasets are streamed from disk in chunks; in-memory ones are chunked from the frame.
+    """
+    path = aggregate_path(dataset.fingerprint, directory)
+    if os.path.exists(path):
+        try:
+            return joblib.load(path)
+        except Exception:
+            pass
+
+    if dataset.path is not None:
+        chunks = iter_data_chunks(dataset.path, chunksize)
+    else:
+        data = dataset.data
+        chunks = (data.iloc[start:start + chunksize] for start in range(0, len(data), chunksize))
+    aggregates = compute_aggregates(chunks)
+
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(aggregates, tmp_path)
+    os.replace(tmp_path, path)
+    return aggregates
+
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+@timed("aggregates")
+def get_aggregates(dataset):
+    return load_or_compute_aggregates(dataset)
@@ -1,24 +1,30 @@
 import streamlit as st
 import pandas as pd
-from sklearn.ensemble import IsolationForest
-from data_loader import preprocess_data
+from data_loader import DATASET_HASH_FUNCS, get_encoder
+from anomaly_stream import StreamingAnomalyDetector
+from instrumentation import timed
 
-@st.cache_resource
-def train_anomaly_detection(data):
-    data = preprocess_data(data)
-    iso_forest = IsolationForest(contamination=0.1, random_state=42)
-    iso_forest.fit(data.drop("class", axis=1))
-    return iso_forest
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+@timed("train_anomaly_detection")
+def train_anomaly_detection(dataset):
+    """
+    Fit the detector once per dataset and keep the per-record scores so page visits don't re-predict.
+    """
+    # The page keeps its detector in memory only; the persisted model belongs to the streaming scorer
+    detector = StreamingAnomalyDetector(get_encoder(dataset), path=None)
+    scores = detector.fit(dataset.data)
+    return detector, scores
 
-def anomaly_detection(data):
+def anomaly_detection(dataset):
     st.header("Anomaly Detection")
     st.write("Identify unusual or fraudulent loan applications.")
 
     # Load the anomaly detection model
-    iso_forest = train_anomaly_detection(data)
+    detector, scores = train_anomaly_detection(dataset)
 
-    # Detect anomalies
-    anomalies = data[iso_forest.predict(preprocess_data(data).drop("class", axis=1)) == -1]
+    # Detect anomalies; a negative score means the record is flagged
+    data = dataset.data
+    anomalies = data[scores < 0].assign(anomaly_score=scores[scores < 0]).sort_values("anomaly_score")
     st.write("### Detected Anomalies")
     st.write(f"{len(anomalies)} unusual loan applications detected. These applications may require further review.")
     st.write(anomalies)
\ No newline at end of file
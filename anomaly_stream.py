@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+from data_loader import CategoricalEncoder, load_dataset
+
+STREAM_MODEL_PATH = os.path.join("artifacts", "anomaly_stream.joblib")
+
+class StreamingAnomalyDetector:
+    """
+    Score loan applications as they arrive against a persisted IsolationForest.
+
+    Scored records are kept in a sliding window of the most recent `window_size` encoded rows.
+    After every `refit_every` new records the model is refitted on that window in a background
+    thread and swapped in atomically, so scoring never waits for a refit and never rescans the
+    full history.
+    """
+
+    def __init__(self, encoder=None, window_size=50_000, refit_every=10_000, contamination=0.1,
+                 random_state=42, path=STREAM_MODEL_PATH):
+        self.encoder = encoder
+        self.window_size = window_size
+        self.refit_every = refit_every
+        self.contamination = contamination
+        self.random_state = random_state
+        self.path = path
+        self.model = None
+        self.window = None
+        self.window_count = 0
+        self.window_pos = 0
+        self.since_refit = 0
+        self.lock = threading.Lock()
+        self.refit_thread = None
+
+    def fit(self, data):
+        """
+        Fit the initial model on `data` (a DataFrame in the dataset schema) and seed the window with its last rows.
+        Returns the anomaly scores of `data` under the fitted model.
+        """
+        if self.encoder is None:
+            self.encoder = CategoricalEncoder().fit(data)
+        X = self.encoder.transform(data)
+        self.window = np.empty((self.window_size, X.shape[1]), dtype=np.float32)
+        self.window_count = self.window_pos = self.since_refit = 0
+        self.append(X)
+        self.model = self.fit_model(X)
+        self.save()
+        return self.model.decision_function(X)
+
+    def fit_model(self, X):
+        model = IsolationForest(contamination=self.contamination, random_state=self.random_state)
+        model.fit(X)
+        return model
+
+    def append(self, X):
+        # Write rows into the ring buffer, keeping only the newest window_size rows
+        X = X[-self.window_size:]
+        end = self.window_pos + len(X)
+        if end <= self.window_size:
+            self.window[self.window_pos:end] = X
+        else:
+            split = self.window_size - self.window_pos
+            self.window[self.window_pos:] = X[:split]
+            self.window[:end - self.window_size] = X[split:]
+        self.window_pos = end % self.window_size
+        self.window_count = min(self.window_count + len(X), self.window_size)
+
+    def score(self, records):
+        """
+        Score one record (dict) or a micro-batch (list of dicts or DataFrame).
+
+        Returns a DataFrame with `anomaly_score` (IsolationForest decision function; negative means anomalous)
+        and `is_anomaly` per record. The records are added to the sliding window and may trigger a background refit.
+        """
+        if isinstance(records, dict):
+            records = [records]
+        frame = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+        X = self.encoder.transform(frame)
+
+        with self.lock:
+            model = self.model
+            self.append(X)
+            self.since_refit += len(X)
+            refit_due = self.since_refit >= self.refit_every
+
+        scores = model.decision_function(X)
+        if refit_due:
+            self.refit(background=True)
+        return pd.DataFrame({"anomaly_score": scores, "is_anomaly": scores < 0}, index=frame.index)
+
+    def refit(self, background=True):
+        """
+        Refit on the current window and swap the new model in. Does nothing if a background refit is already running.
+        """
+        def run(snapshot):
+            model = self.fit_model(snapshot)
+            with self.lock:
+                self.model = model
+            self.save()
+
+        # Check and start under the lock so concurrent score() calls cannot both start a refit
+        with self.lock:
+            if self.refit_thread is not None and self.refit_thread.is_alive():
+                return
+            snapshot = self.window[:self.window_count].copy()
+            self.since_refit = 0
+            if background:
+                self.refit_thread = threading.Thread(target=run, args=(snapshot,), daemon=True)
+                self.refit_thread.start()
+                return
+        run(snapshot)
+
+    def wait(self):
+        """
+        Block until a running background refit has finished.
+        """
+        if self.refit_thread is not None:
+            self.refit_thread.join()
+
+    def save(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Copy the arrays append() writes in place while holding the lock, so the dump below is a consistent snapshot
+        with self.lock:
+            state = {key: value.copy() if isinstance(value, np.ndarray) else value
+                     for key, value in self.__dict__.items() if key not in ("lock", "refit_thread")}
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path=STREAM_MODEL_PATH):
+        detector = cls.__new__(cls)
+        detector.__dict__.update(joblib.load(path))
+        detector.lock = threading.Lock()
+        detector.refit_thread = None
+        return detector
+
+def main():
+    """
+    Score JSON-lines applications from stdin in micro-batches and print one score per line.
+    """
+    parser = argparse.ArgumentParser(description="Stream loan applications through the anomaly detector.")
+    parser.add_argument("--model", default=STREAM_MODEL_PATH, help="persisted detector to load (fitted on the dataset if missing)")
+    parser.add_argument("--batch-size", type=int, default=100, help="records scored per micro-batch")
+    args = parser.parse_args()
+
+    if os.path.exists(args.model):
+        detector = StreamingAnomalyDetector.load(args.model)
+    else:
+        detector = StreamingAnomalyDetector(path=args.model)
+        detector.fit(load_dataset())
+
+    def flush(batch):
+        for record in detector.score(batch).to_dict(orient="records"):
+            print(json.dumps(record))
+
+    batch = []
+    for line in sys.stdin:
+        if line.strip():
+            batch.append(json.loads(line))
+        if len(batch) >= args.batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    # Persist the window so the next run continues from where this one stopped
+    detector.wait()
+    detector.save()
+
+if __name__ == "__main__":
+    main()
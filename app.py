@@ -1,64 +1,73 @@
+import importlib
 import streamlit as st
-from data_loader import load_data
-from credit_risk_model import credit_risk_prediction
-from clustering_model import customer_segmentation
-from anomaly_detection import anomaly_detection
-from fairness_analysis import fairness_analysis
-from loan_recommendations import loan_recommendations
-from dashboard import dashboard
-from finance_advisor import personal_finance_advisor
-from fn import Personal_Finance_Advisor_with_Macroeconomic_Insights
+from instrumentation import start_run, timed, timing_panel
+
+# Sidebar entry -> (module, page function, whether the page takes the dataset handle). Page modules pull in
+# scikit-learn, matplotlib and seaborn, so each is imported only when its page is first opened.
+PAGES = {
+    "Credit Risk Prediction": ("credit_risk_model", "credit_risk_prediction", True),
+    "Customer Segmentation": ("clustering_model", "customer_segmentation", True),
+    "Anomaly Detection": ("anomaly_detection", "anomaly_detection", True),
+    "Fairness Analysis": ("fairness_analysis", "fairness_analysis", True),
+    "Loan Recommendations": ("loan_recommendations", "loan_recommendations", False),
+    "Dashboard": ("dashboard", "dashboard", True),
+    "Personal Finance Advisor": ("finance_advisor", "personal_finance_advisor", False),
+    "Personal Finance Advisor with Macroeconomic Insights": ("fn", "Personal_Finance_Advisor_with_Macroeconomic_Insights", False),
+}
+
+def load_page(name):
+    """
+    The page function for a sidebar entry, importing its module on first use; None when the module is not installed.
+    """
+    module_name, function_name, _ = PAGES[name]
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as exc:
+        # Only a missing page module degrades gracefully; a missing dependency inside it is a real error
+        if exc.name != module_name:
+            raise
+        return None
+    return getattr(module, function_name)
+
+def home():
+    st.header("Welcome to the Credit Risk Management System")
+    st.write("This system helps you predict credit risk, segment customers, detect anomalies, and more.")
+    st.write("Use the sidebar to navigate through the features.")
+    st.write("### Features:")
+    st.write("- **Credit Risk Prediction**: Predict whether a customer is a good or bad credit risk.")
+    st.write("- **Customer Segmentation**: Group customers into clusters based on credit behavior.")
+    st.write("- **Anomaly Detection**: Identify unusual or fraudulent loan applications.")
+    st.write("- **Fairness Analysis**: Analyze potential biases in the model.")
+    st.write("- **Loan Recommendations**: Suggest loan products based on customer profiles.")
+    st.write("- **Dashboard**: Visualize key insights and distributions.")
+    st.write("- **Personal Finance Advisor**: Get personalized financial advice.")
+    st.write("- **Personal Finance Advisor with Macroeconomic Insights**: Get economic insights.")
 
 # Streamlit App
 def main():
+    start_run()
     st.title("Credit Risk Management System")
-    
+
     # Sidebar for navigation
     st.sidebar.title("Navigation")
-    options = ["Home", "Credit Risk Prediction", "Customer Segmentation", "Anomaly Detection", 
-               "Fairness Analysis", "Loan Recommendations", "Dashboard", "Personal Finance Advisor","Personal_Finance_Advisor_with_Macroeconomic_Insights"]
+    options = ["Home"] + list(PAGES)
     choice = st.sidebar.selectbox("Choose a section", options)
 
-    # Load data
-    data = load_data()
-
-    if choice == "Home":
-        st.header("Welcome to the Credit Risk Management System")
-        st.write("This system helps you predict credit risk, segment customers, detect anomalies, and more.")
-        st.write("Use the sidebar to navigate through the features.")
-        st.write("### Features:")
-        st.write("- **Credit Risk Prediction**: Predict whether a customer is a good or bad credit risk.")
-        st.write("- **Customer Segmentation**: Group customers into clusters based on credit behavior.")
-        st.write("- **Anomaly Detection**: Identify unusual or fraudulent loan applications.")
-        st.write("- **Fairness Analysis**: Analyze potential biases in the model.")
-        st.write("- **Loan Recommendations**: Suggest loan products based on customer profiles.")
-        st.write("- **Dashboard**: Visualize key insights and distributions.")
-        st.write("- **Personal Finance Advisor**: Get personalized financial advice.")
-        st.write("- **Personal Finance Advisor_1**: Get economic insights.")
-
-    elif choice == "Credit Risk Prediction":
-        credit_risk_prediction(data)
-
-    elif choice == "Customer Segmentation":
-        customer_segmentation(data)
-
-    elif choice == "Anomaly Detection":
-        anomaly_detection(data)
-
-    elif choice == "Fairness Analysis":
-        fairness_analysis(data)
-
-    elif choice == "Loan Recommendations":
-        loan_recommendations()
-
-    elif choice == "Dashboard":
-        dashboard(data)
+    with timed(f"page:{choice}"):
+        if choice == "Home":
+            home()
+        else:
+            page = load_page(choice)
+            if page is None:
+                st.warning(f"The {choice} page is not available in this installation.")
+            elif PAGES[choice][2]:
+                # Dataset handle; pages load the DataFrame through it and cache on its fingerprint
+                from data_loader import get_dataset
+                page(get_dataset())
+            else:
+                page()
 
-    elif choice == "Personal Finance Advisor":
-        personal_finance_advisor()
-        
-    elif choice == "Personal Finance Advisor_1":
-        Personal_Finance_Advisor_with_Macroeconomic_Insights()    
+    timing_panel()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
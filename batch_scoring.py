@@ -0,0 +1,123 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from data_loader import DATA_PATH, iter_data_chunks, load_dataset
+from credit_risk_model import load_models
+from ensemble_scorer import EnsembleScorer
+
+def model_column(name):
+    # "K-Nearest Neighbors" -> "k_nearest_neighbors_proba"
+    return name.lower().replace("-", " ").replace(" ", "_") + "_proba"
+
+def is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+def iter_chunks(path, chunksize):
+    """
+    Yield the input file as DataFrames of at most `chunksize` rows.
+    """
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from iter_data_chunks(path, chunksize)
+
+class ChunkWriter:
+    """
+    Append scored chunks to a CSV or Parquet file without holding earlier chunks in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet_writer = None
+        self.wrote_header = False
+
+    def write(self, frame):
+        if is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.parquet_writer is None:
+                self.parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self.parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a" if self.wrote_header else "w", header=not self.wrote_header, index=False)
+            self.wrote_header = True
+
+    def close(self):
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+
+def score_chunk(bundle, chunk, model_names=None, keep_columns=()):
+    """
+    Score one chunk with every model in one vectorized predict_proba call per model.
+
+    Returns a DataFrame with the probability of a 'good' credit risk per model, their mean as the
+    ensemble score, and the ensemble prediction.
+    """
+    scores = score_encoded(bundle, bundle["encoder"].transform(chunk), model_names)
+    for i, col in enumerate(keep_columns):
+        scores.insert(i, col, chunk[col].to_numpy())
+    return scores
+
+def score_encoded(bundle, X, model_names=None):
+    """
+    Score rows already encoded with the bundle's encoder; the columns are those of score_chunk.
+    """
+    scorer = EnsembleScorer(bundle, model_names)
+    scores = pd.DataFrame(index=pd.RangeIndex(len(X)))
+    probabilities = scorer.member_probabilities(X, scorer.members)
+    for i, name in enumerate(scorer.members):
+        scores[model_column(name)] = probabilities[:, i]
+
+    scores["ensemble_proba"] = scorer.combine(probabilities, scorer.members)
+    scores["ensemble_prediction"] = np.where(scores["ensemble_proba"] >= 0.5, "good", "bad")
+    return scores
+
+def score_file(input_path, output_path, bundle, chunksize=100_000, model_names=None, keep_columns=(), progress=None):
+    """
+    Stream `input_path` through the models chunk by chunk and write the scores to `output_path`.
+
+    Memory use is bounded by the chunk size, not the file size.
+    `progress` is called as progress(rows_done, elapsed_seconds) after each chunk.
+    Returns a dict with the row count, elapsed seconds and rows/sec throughput.
+    """
+    writer = ChunkWriter(output_path)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(input_path, chunksize):
+            writer.write(score_chunk(bundle, chunk, model_names, keep_columns))
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows, time.perf_counter() - start)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {"rows": rows, "seconds": elapsed, "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of applicants with the credit risk models.")
+    parser.add_argument("input", help="CSV or Parquet file in the same schema as the training data")
+    parser.add_argument("output", help="output file; .parquet/.pq writes Parquet, anything else CSV")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows scored per chunk")
+    parser.add_argument("--train-data", default=DATA_PATH, help="dataset the stored models were trained on")
+    parser.add_argument("--models", nargs="+", help="subset of model names to score with (default: all)")
+    parser.add_argument("--keep", nargs="+", default=[], help="input columns copied to the output, e.g. an ID column")
+    args = parser.parse_args(argv)
+
+    bundle = load_models(load_dataset(args.train_data))
+
+    def print_progress(rows, elapsed):
+        print(f"{rows:,} rows scored ({rows / max(elapsed, 1e-9):,.0f} rows/sec)", file=sys.stderr)
+
+    stats = score_file(args.input, args.output, bundle, args.chunksize, args.models, args.keep, print_progress)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.1f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from aggregate_store import compute_aggregates
+from anomaly_stream import StreamingAnomalyDetector
+from batch_scoring import score_chunk
+from credit_risk_model import fit_models, load_models
+from data_generator import CreditDataGenerator
+from data_loader import DATA_PATH, load_dataset, preprocess_data
+from segmentation_engine import SegmentationEngine, frame_chunks
+
+RESULTS_PATH = os.path.join("artifacts", "benchmark_results.json")
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+
+def run_preprocess(data):
+    preprocess_data(data)
+
+def run_dashboard_aggregates(data):
+    compute_aggregates(frame_chunks(data, 100_000))
+
+def run_train_models(data):
+    fit_models(data)
+
+def run_anomaly_detection(data):
+    StreamingAnomalyDetector(path=None).fit(data)
+
+def run_segmentation(data):
+    engine = SegmentationEngine().fit(data)
+    engine.assign_chunks(frame_chunks(data, 100_000))
+
+def run_batch_scoring(data, bundle):
+    for chunk in frame_chunks(data, 100_000):
+        score_chunk(bundle, chunk)
+
+# Compute path behind each page, and the largest size it is run at. Training fits an RBF SVC with
+# Platt scaling, whose cost grows quadratically, so it stops at 10k rows.
+CASES = {
+    "preprocess_data": (run_preprocess, None),
+    "dashboard_aggregates": (run_dashboard_aggregates, None),
+    "train_models": (run_train_models, 10_000),
+    "anomaly_detection": (run_anomaly_detection, None),
+    "segmentation": (run_segmentation, None),
+    "batch_scoring": (run_batch_scoring, None),
+}
+
+def max_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 ** 2 if sys.platform == "darwin" else rss / 1024
+
+def run_case(name, n_rows, source_path, seed):
+    """
+    Generate the data and run one case in the current process. Meant to run in a fresh worker process
+    so peak memory is not inflated by earlier cases.
+    """
+    fn, _ = CASES[name]
+    source = load_dataset(source_path)
+    data = pd.concat(CreditDataGenerator().fit(source).sample_chunks(n_rows, seed=seed), ignore_index=True)
+    args = [data]
+    if name == "batch_scoring":
+        # Scoring uses the models trained on the bundled dataset, outside the timed region
+        args.append(load_models(source))
+
+    baseline_rss = max_rss_mb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "case": name,
+        "rows": n_rows,
+        "seconds": seconds,
+        "rows_per_sec": n_rows / seconds if seconds > 0 else None,
+        "peak_traced_mb": peak / 1024 ** 2,
+        "max_rss_mb": max_rss_mb(),
+        "max_rss_increase_mb": max_rss_mb() - baseline_rss,
+        "status": "ok",
+    }
+
+def run_benchmarks(cases, sizes, source_path=DATA_PATH, seed=0, progress=None):
+    """
+    Run every case at every size, each in its own worker process. A failing case is recorded with its error.
+    """
+    results = []
+    for n_rows in sizes:
+        for name in cases:
+            limit = CASES[name][1]
+            if limit is not None and n_rows > limit:
+                result = {"case": name, "rows": n_rows, "status": "skipped", "reason": f"runs up to {limit:,} rows"}
+            else:
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    try:
+                        result = executor.submit(run_case, name, n_rows, source_path, seed).result()
+                    except Exception as exc:
+                        result = {"case": name, "rows": n_rows, "status": "error", "error": repr(exc)}
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return results
+
+# Run in a fresh interpreter: time from the start of the script run until the Home page has rendered,
+# and count the scikit-learn, matplotlib and seaborn modules that were imported on the way
+STARTUP_SNIPPET = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=600).run()
+seconds = time.perf_counter() - start
+heavy = [m for m in sys.modules if m.split(".")[0] in ("sklearn", "matplotlib", "seaborn")]
+print(json.dumps({"seconds": seconds, "heavy_modules": len(heavy), "error": bool(at.exception)}))
+"""
+
+def measure_startup(script="app.py", runs=3):
+    """
+    Cold-start time of the Streamlit app until the Home page is rendered, best of `runs` fresh processes.
+    """
+    measurements = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", STARTUP_SNIPPET, os.path.abspath(script)], capture_output=True, text=True, check=True)
+        measurements.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    best = min(measurements, key=lambda m: m["seconds"])
+    return {"case": "startup", "script": script, "runs": runs, **best}
+
+def write_results(results, path=RESULTS_PATH):
+    payload = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each page's compute path on synthetic data of growing size.")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--source", default=DATA_PATH, help="dataset the synthetic data generator learns from")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--startup", nargs="+", metavar="SCRIPT",
+                        help="only measure how long these app scripts take to render the Home page")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        for script in args.startup:
+            result = measure_startup(script)
+            print(f"{script:<22} Home page in {result['seconds']:.2f}s, {result['heavy_modules']} heavy modules imported"
+                  + (" (script raised an exception)" if result["error"] else ""), flush=True)
+        return
+
+    def print_progress(result):
+        if result["status"] == "ok":
+            print(f"{result['case']:<22} {result['rows']:>11,} rows  {result['seconds']:9.2f}s  "
+                  f"{result['rows_per_sec']:>13,.0f} rows/s  peak {result['peak_traced_mb']:9.1f} MB traced, "
+                  f"{result['max_rss_mb']:9.1f} MB RSS", flush=True)
+        else:
+            print(f"{result['case']:<22} {result['rows']:>11,} rows  {result['status']}: "
+                  f"{result.get('reason') or result.get('error')}", flush=True)
+
+    results = run_benchmarks(args.cases, args.sizes, args.source, args.seed, print_progress)
+    write_results(results, args.output)
+    print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
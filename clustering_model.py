@@ -1,13 +1,21 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from data_loader import preprocess_data
-
-def customer_segmentation(data):
+from data_loader import DATASET_HASH_FUNCS, get_encoder, preprocess_data
+from segmentation_engine import load_or_fit_segments
+from plotting import plot_cluster_grid
+from instrumentation import timed
+
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+@timed("segment_customers")
+def segment_customers(dataset):
+    return load_or_fit_segments(dataset.data, dataset.fingerprint, get_encoder(dataset))
+
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+@timed("encode_segmentation_data")
+def encoded_data(dataset):
+    return preprocess_data(dataset.data, get_encoder(dataset))
+
+def customer_segmentation(dataset):
     """
     Perform customer segmentation using KMeans clustering and display insights.
     """
@@ -17,12 +25,8 @@ def customer_segmentation(data):
         "This helps in understanding different customer groups and tailoring strategies for each group."
     )
 
-    # Preprocess the data
-    data = preprocess_data(data)
-
-    # Standardize the data
-    scaler = StandardScaler()
-    scaled_data = scaler.fit_transform(data.drop("class", axis=1))
+    # Preprocess the data; the encoded frame is cached, and the page adds its columns to a shallow copy
+    data = encoded_data(dataset).copy(deep=False)
 
     # Train the KMeans model
     st.write("### Training the KMeans Clustering Model")
@@ -31,11 +35,11 @@ def customer_segmentation(data):
         "The data is standardized to ensure all features contribute equally to the clustering process."
     )
 
-    kmeans = KMeans(n_clusters=3, random_state=42)
-    kmeans.fit(scaled_data)
+    # Fitted scaler, centroids and assignments are stored, so this only fits when the dataset changes
+    engine = segment_customers(dataset)
 
     # Assign clusters to the data
-    data["Cluster"] = kmeans.predict(scaled_data)
+    data["Cluster"] = engine.assignments
 
     # Display cluster distribution
     st.write("### Cluster Distribution")
@@ -79,12 +83,12 @@ def customer_segmentation(data):
     )
 
     # Select a subset of features for visualization
-    features_for_plot = ["age", "credit_amount", "duration", "Cluster"]
-    plot_data = data[features_for_plot]
+    features_for_plot = ["age", "credit_amount", "duration"]
 
-    # Create a pair plot
-    fig = sns.pairplot(plot_data, hue="Cluster", palette="viridis")
-    st.pyplot(fig)
+    # Create a pair plot from bin counts and a stratified sample, so render time doesn't grow with the data
+    with timed("render:cluster_grid"):
+        fig = plot_cluster_grid(data, features_for_plot, hue="Cluster", palette="viridis")
+        st.pyplot(fig)
 
     # Provide actionable recommendations
     st.write("### Recommendations for Each Cluster")
@@ -1,15 +1,23 @@
+import json
+import os
 import streamlit as st
+from functools import partial
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
-from sklearn.neighbors import KNeighborsClassifier
 from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
-from data_loader import preprocess_data
+from data_loader import DATASET_HASH_FUNCS, CategoricalEncoder, get_dataset
+from ensemble_scorer import EnsembleScorer, compare_fast_path
+from instrumentation import timed
+from knn_index import KNNIndexClassifier
+from model_store import dataset_fingerprint, load_or_train
+from training_engine import fit_model_zoo
+from tree_export import compile_bundle
 
 # Unified function to calculate performance metrics
 def evaluate_model(model, X_test, y_test, model_name):
@@ -29,46 +37,105 @@ def evaluate_model(model, X_test, y_test, model_name):
         "confusion_matrix": confusion_matrix(y_test, y_pred)
     }
 
-@st.cache_resource
-def train_models(data):
-    data = preprocess_data(data)
-    X = data.drop("class", axis=1)
-    y = data["class"]
-
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-    # Train all 6 models
-    rf_model = RandomForestClassifier(random_state=42)
-    rf_model.fit(X_train, y_train)
-    rf_metrics = evaluate_model(rf_model, X_test, y_test, "Random Forest")
-
-    lr_model = LogisticRegression(max_iter=1000, random_state=42)
-    lr_model.fit(X_train, y_train)
-    lr_metrics = evaluate_model(lr_model, X_test, y_test, "Logistic Regression")
-
-    gb_model = GradientBoostingClassifier(random_state=42)
-    gb_model.fit(X_train, y_train)
-    gb_metrics = evaluate_model(gb_model, X_test, y_test, "Gradient Boosting")
-
-    knn_model = KNeighborsClassifier()
-    knn_model.fit(X_train, y_train)
-    knn_metrics = evaluate_model(knn_model, X_test, y_test, "K-Nearest Neighbors")
-
-    svm_model = SVC(probability=True, random_state=42)
-    svm_model.fit(X_train, y_train)
-    svm_metrics = evaluate_model(svm_model, X_test, y_test, "Support Vector Machine")
-
-    dt_model = DecisionTreeClassifier(random_state=42)
-    dt_model.fit(X_train, y_train)
-    dt_metrics = evaluate_model(dt_model, X_test, y_test, "Decision Tree")
-
-    return (
-        rf_model, lr_model, gb_model, knn_model, svm_model, dt_model,
-        X.columns,
-        rf_metrics, lr_metrics, gb_metrics, knn_metrics, svm_metrics, dt_metrics
+MODEL_CLASSES = {
+    "Random Forest": RandomForestClassifier,
+    "Logistic Regression": LogisticRegression,
+    "Gradient Boosting": GradientBoostingClassifier,
+    "K-Nearest Neighbors": KNNIndexClassifier,
+    "Support Vector Machine": SVC,
+    "Decision Tree": DecisionTreeClassifier,
+}
+
+# Hyperparameters for each model; these are part of the artifact key, so changing them triggers a refit
+MODEL_PARAMS = {
+    "Random Forest": {"random_state": 42},
+    "Logistic Regression": {"max_iter": 1000, "random_state": 42},
+    "Gradient Boosting": {"random_state": 42},
+    "K-Nearest Neighbors": {},
+    "Support Vector Machine": {"probability": True, "random_state": 42},
+    "Decision Tree": {"random_state": 42},
+}
+
+# Winning configurations written by hyperparam_search; merged over MODEL_PARAMS when present
+TUNED_PARAMS_PATH = os.path.join("artifacts", "tuned_params.json")
+
+def model_params(fingerprint, tuned_path=TUNED_PARAMS_PATH):
+    """
+    MODEL_PARAMS with any tuned hyperparameters applied on top. Parameters tuned on a dataset with a
+    different fingerprint are ignored.
+    """
+    if not os.path.exists(tuned_path):
+        return MODEL_PARAMS
+    with open(tuned_path) as f:
+        tuned = json.load(f)
+    if tuned.get("dataset") != fingerprint:
+        return MODEL_PARAMS
+    return {name: {**params, **tuned["params"].get(name, {})} for name, params in MODEL_PARAMS.items()}
+
+def split_data(data):
+    """
+    Fit the encoder and return (encoder, X_train, X_test, y_train, y_test) with the fixed 80/20 split.
+    """
+    encoder = CategoricalEncoder().fit(data)
+    X = encoder.transform(data)
+    y = data["class"].to_numpy()
+    return (encoder, *train_test_split(X, y, test_size=0.2, random_state=42))
+
+def fit_models(data, params=MODEL_PARAMS, n_workers=None, timeout=None, progress=None):
+    """
+    Fit all 6 models and return a bundle with the fitted models, encoder, feature columns and test metrics.
+    Models are fitted concurrently by the training engine; see fit_model_zoo for the options.
+    """
+    encoder, X_train, X_test, y_train, y_test = split_data(data)
+
+    models, metrics = fit_model_zoo(
+        MODEL_CLASSES, params, X_train, y_train, X_test, y_test, evaluate_model,
+        n_workers=n_workers, timeout=timeout, progress=progress
     )
-
-def credit_risk_prediction(data):
+    return {"models": models, "encoder": encoder, "columns": encoder.feature_names_, "metrics": metrics}
+
+def load_models(data, retrain=False, n_workers=None, timeout=None, progress=None):
+    """
+    Load the fitted models for this dataset from the artifact store, fitting them on a miss or when retrain=True.
+    Tuned hyperparameters are part of the artifact key, so a new search result triggers a refit.
+    """
+    train_fn = partial(fit_models, n_workers=n_workers, timeout=timeout, progress=progress)
+    fingerprint = dataset_fingerprint(data)
+    return load_or_train(data, train_fn, model_params(fingerprint), retrain=retrain, model_classes=MODEL_CLASSES,
+                         fingerprint=fingerprint)
+
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+@timed("train_models")
+def train_models(dataset):
+    return load_models(dataset.data)
+
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+@timed("compile_models")
+def compiled_models(dataset):
+    """
+    The train_models bundle with the tree models exported for fast single-row scoring.
+    """
+    return compile_bundle(train_models(dataset))
+
+def retrain_models(dataset, n_workers=None, progress=None):
+    """
+    Force a rebuild of the stored artifacts and drop the in-process cache.
+    """
+    load_models(dataset.data, retrain=True, n_workers=n_workers, progress=progress)
+    train_models.clear()
+    compiled_models.clear()
+    ensemble_report.clear()
+
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+def ensemble_report(dataset):
+    """
+    Full ensemble versus fast path on the held-out split, timed one applicant at a time with the compiled
+    models the page scores with. Takes seconds, so it only runs on request.
+    """
+    _, _, X_test, _, y_test = split_data(dataset.data)
+    return compare_fast_path(EnsembleScorer(compiled_models(dataset)), X_test, y_test, repeats=1)
+
+def credit_risk_prediction(dataset):
     st.header("Credit Risk Prediction")
     st.write("Enter customer details to check their credit risk.")
 
@@ -85,6 +152,13 @@ def credit_risk_prediction(data):
     housing = st.selectbox("Housing Status", ["own", "rent", "for free"])
     job = st.selectbox("Job Type", ["unskilled resident", "skilled", "high qualif/self emp/mgmt", "unemp/unskilled non res"])
 
+    if st.sidebar.button("Retrain Models"):
+        progress_bar = st.sidebar.progress(0.0)
+        def show_progress(name, done, total, elapsed):
+            progress_bar.progress(done / total, text=f"{name} fitted ({done}/{total}, {elapsed:.1f}s)")
+        retrain_models(dataset, progress=show_progress)
+        st.sidebar.success("Models retrained and saved.")
+
     if st.button("Check Credit Risk"):
         input_data = pd.DataFrame({
             "age": [age], "credit_amount": [credit_amount], "duration": [duration],
@@ -93,26 +167,29 @@ def credit_risk_prediction(data):
             "employment": [employment], "personal_status": [personal_status],
             "housing": [housing], "job": [job]
         })
-        input_data = pd.get_dummies(input_data, drop_first=True)
-
-        models = train_models(data)
-
-        rf_model, lr_model, gb_model, knn_model, svm_model, dt_model, X_columns = models[:7]
-        rf_metrics, lr_metrics, gb_metrics, knn_metrics, svm_metrics, dt_metrics = models[7:]
 
-        for col in X_columns:
-            if col not in input_data.columns:
-                input_data[col] = 0
-        input_data = input_data[X_columns]
-
-        predictions = {
-            "Random Forest": rf_model.predict(input_data)[0],
-            "Logistic Regression": lr_model.predict(input_data)[0],
-            "Gradient Boosting": gb_model.predict(input_data)[0],
-            "K-Nearest Neighbors": knn_model.predict(input_data)[0],
-            "Support Vector Machine": svm_model.predict(input_data)[0],
-            "Decision Tree": dt_model.predict(input_data)[0]
-        }
+        bundle = train_models(dataset)
+        all_metrics = [bundle["metrics"][name] for name in MODEL_CLASSES]
+
+        scorer = EnsembleScorer(compiled_models(dataset))
+        with timed("predict"):
+            # Encode with the training vocabulary; fields not on the form are left at zero
+            X_input = bundle["encoder"].transform(input_data)
+
+            # One batched pass over the shared encoded row gives every member's probability and the soft vote
+            probabilities = scorer.member_probabilities(X_input, scorer.members)[0]
+            ensemble_proba = scorer.combine(probabilities, scorer.members)
+            # Each model's own verdict. For every member but SVC, predict() is the more probable class, so it is read
+            # off the probabilities above; SVC predicts from its decision function, which can disagree with its
+            # Platt-scaled probability, so only SVC runs again
+            predictions = {}
+            for name, proba in zip(scorer.members, probabilities):
+                model = scorer.bundle["models"][name]
+                predictions[name] = model.predict(X_input)[0] if isinstance(model, SVC) else ("good" if proba > 0.5 else "bad")
+
+        st.write("### Ensemble decision (soft vote of all models):")
+        ensemble_label = "Low Risk ✅" if ensemble_proba >= 0.5 else "High Risk ❌"
+        st.write(f"**{ensemble_label}** (probability of good credit {ensemble_proba:.2f})")
 
         st.write("### Predictions from each model:")
         for model, pred in predictions.items():
@@ -130,7 +207,7 @@ def credit_risk_prediction(data):
             st.write(f"- ROC AUC: {metrics['roc_auc']:.2f}")
             st.write("")
 
-        for metrics in [rf_metrics, lr_metrics, gb_metrics, knn_metrics, svm_metrics, dt_metrics]:
+        for metrics in all_metrics:
             display_metrics(metrics)
 
         st.write("---")
@@ -142,11 +219,27 @@ def credit_risk_prediction(data):
             ax.set_xlabel("Predicted")
             ax.set_ylabel("Actual")
 
-        fig, axes = plt.subplots(2, 3, figsize=(18, 10))
-        matrices = [rf_metrics, lr_metrics, gb_metrics, knn_metrics, svm_metrics, dt_metrics]
-        titles = ["Random Forest", "Logistic Regression", "Gradient Boosting", "KNN", "SVM", "Decision Tree"]
-
-        for i, (metrics, title) in enumerate(zip(matrices, titles)):
-            plot_confusion_matrix(metrics, axes[i//3, i%3], title)
-
-        st.pyplot(fig)
+        with timed("render:confusion_matrices"):
+            fig, axes = plt.subplots(2, 3, figsize=(18, 10))
+            matrices = all_metrics
+            titles = ["Random Forest", "Logistic Regression", "Gradient Boosting", "KNN", "SVM", "Decision Tree"]
+
+            for i, (metrics, title) in enumerate(zip(matrices, titles)):
+                plot_confusion_matrix(metrics, axes[i//3, i%3], title)
+
+            st.pyplot(fig)
+
+    if st.sidebar.button("Benchmark Ensemble Fast Path"):
+        with st.spinner("Scoring the test split one applicant at a time..."):
+            report = ensemble_report(dataset)
+        st.sidebar.write("**Ensemble fast path on the test split**")
+        st.sidebar.write(f"- Rows decided by the fast models alone: {report['fast_path_share']:.0%}")
+        st.sidebar.write(f"- Accuracy: full ensemble {report['full_accuracy']:.3f}, fast path {report['fast_accuracy']:.3f}")
+        st.sidebar.write(f"- Latency per applicant: full {report['full_ms_per_row']:.2f} ms, "
+                         f"fast path {report['fast_ms_per_row']:.2f} ms ({report['speedup']:.1f}x)")
+
+if __name__ == "__main__":
+    # Rebuild the stored model artifacts from the bundled dataset
+    def print_progress(name, done, total, elapsed):
+        print(f"[{done}/{total}] {name} fitted after {elapsed:.1f}s")
+    retrain_models(get_dataset(), progress=print_progress)
@@ -1,13 +1,17 @@
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import numpy as np
+from plotting import plot_histogram
+from aggregate_store import get_aggregates
+from instrumentation import timed
 
-def dashboard(data):
+def dashboard(dataset):
     """
     Display a dashboard with key insights and visualizations.
     """
+    # All statistics come from the precomputed aggregates, so page loads don't depend on the number of rows
+    aggregates = get_aggregates(dataset)
+
     st.header("Dashboard")
     st.write(
         "This dashboard provides key insights and visualizations to help you understand the credit risk dataset. "
@@ -20,7 +24,7 @@ def dashboard(data):
         "The bar chart below shows the distribution of customers by credit risk class. "
         "This helps you understand the proportion of 'good' and 'bad' credit risks in the dataset."
     )
-    risk_distribution = data["class"].value_counts()
+    risk_distribution = aggregates.class_distribution()
     st.bar_chart(risk_distribution)
 
     # Add insights
@@ -40,12 +44,13 @@ def dashboard(data):
         "The histogram below shows the distribution of credit amounts requested by customers. "
         "This helps you understand the range and frequency of loan amounts."
     )
-    fig, ax = plt.subplots()
-    sns.histplot(data["credit_amount"], bins=20, kde=True, ax=ax, color="skyblue")
-    ax.set_xlabel("Credit Amount")
-    ax.set_ylabel("Frequency")
-    ax.set_title("Distribution of Credit Amounts")
-    st.pyplot(fig)
+    with timed("render:credit_amount_histogram"):
+        fig, ax = plt.subplots()
+        plot_histogram(*aggregates.histogram("credit_amount", bins=20), ax, color="skyblue")
+        ax.set_xlabel("Credit Amount")
+        ax.set_ylabel("Frequency")
+        ax.set_title("Distribution of Credit Amounts")
+        st.pyplot(fig)
 
     # Add insights
     st.write("#### Insights")
@@ -64,12 +69,13 @@ def dashboard(data):
         "The histogram below shows the distribution of customer ages. "
         "This helps you understand the demographic profile of customers."
     )
-    fig, ax = plt.subplots()
-    sns.histplot(data["age"], bins=20, kde=True, ax=ax, color="salmon")
-    ax.set_xlabel("Age")
-    ax.set_ylabel("Frequency")
-    ax.set_title("Distribution of Customer Ages")
-    st.pyplot(fig)
+    with timed("render:age_histogram"):
+        fig, ax = plt.subplots()
+        plot_histogram(*aggregates.histogram("age", bins=20), ax, color="salmon")
+        ax.set_xlabel("Age")
+        ax.set_ylabel("Frequency")
+        ax.set_title("Distribution of Customer Ages")
+        st.pyplot(fig)
 
     # Add insights
     st.write("#### Insights")
@@ -88,11 +94,11 @@ def dashboard(data):
         "The heatmap below shows the correlation between numeric features in the dataset. "
         "This helps you understand relationships between variables, such as credit amount and age."
     )
-    numeric_data = data.select_dtypes(include=[float, int])
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(numeric_data.corr(), annot=True, cmap="coolwarm", ax=ax)
-    ax.set_title("Correlation Heatmap")
-    st.pyplot(fig)
+    with timed("render:correlation_heatmap"):
+        fig, ax = plt.subplots(figsize=(10, 6))
+        sns.heatmap(aggregates.corr(), annot=True, cmap="coolwarm", ax=ax)
+        ax.set_title("Correlation Heatmap")
+        st.pyplot(fig)
 
     # Add insights
     st.write("#### Insights")
@@ -111,7 +117,7 @@ def dashboard(data):
         "The table below summarizes key statistics for numeric features in the dataset. "
         "This provides a quick overview of the data distribution."
     )
-    st.write(numeric_data.describe())
+    st.write(aggregates.describe())
 
     # Conclusion
     st.write("### Conclusion")
@@ -0,0 +1,245 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from data_loader import DATA_PATH, load_dataset
+from training_engine import default_workers
+
+# Parent of each column in the generative model. Columns are sampled in this order, each from its
+# distribution given the parent's sampled value; None means the column's marginal distribution.
+# class depends on checking_status, credit_amount on the duration band, everything else on class.
+DEPENDENCIES = {
+    "checking_status": None,
+    "class": "checking_status",
+    "duration": "class",
+    "credit_amount": "duration_band",
+}
+
+# Number of quantile bands of duration that credit_amount is conditioned on
+DURATION_BANDS = 6
+
+class CreditDataGenerator:
+    """
+    Synthetic credit customers in the 21-column schema of the bundled dataset.
+
+    fit() learns each column's empirical distribution conditioned on its parent (see DEPENDENCIES),
+    so the class balance per checking_status and the spread of credit amounts per loan duration
+    follow the source data. Every sampled value is one observed in the source. Each column is sampled
+    for all rows at once with alias tables, and chunks are independent, so they can be generated in
+    parallel from spawned seeds.
+    """
+
+    def __init__(self, dependencies=DEPENDENCIES, duration_bands=DURATION_BANDS):
+        self.dependencies = dependencies
+        self.duration_bands = duration_bands
+
+    def parent(self, col):
+        return self.dependencies.get(col, "class")
+
+    def fit(self, source):
+        self.columns = list(source.columns)
+        self.dtypes = {col: source[col].dtype for col in self.columns}
+        quantiles = np.linspace(0, 1, self.duration_bands + 1)[1:-1]
+        self.band_edges = np.unique(np.quantile(source["duration"].to_numpy(), quantiles))
+
+        self.order = [col for col in self.dependencies if col in self.columns]
+        self.order += [col for col in self.columns if col not in self.order]
+
+        # Per column: the observed values and a (parent value, value) probability matrix
+        self.values = {}
+        self.probabilities = {}
+        codes = {}
+        for col in self.order:
+            if isinstance(self.dtypes[col], pd.CategoricalDtype):
+                self.values[col] = np.asarray(self.dtypes[col].categories)
+                codes[col] = source[col].cat.codes.to_numpy().astype(np.int64)
+            else:
+                self.values[col], codes[col] = np.unique(source[col].to_numpy(), return_inverse=True)
+
+            parent_codes, n_parents = self.parent_codes(col, codes, len(source))
+            counts = np.zeros((n_parents, len(self.values[col])))
+            np.add.at(counts, (parent_codes, codes[col]), 1)
+            # Parent values never seen together with this column fall back to its marginal distribution
+            marginal = counts.sum(axis=0)
+            counts[counts.sum(axis=1) == 0] = marginal
+            self.probabilities[col] = counts / counts.sum(axis=1, keepdims=True)
+
+        # One alias table per (column, parent value) makes sampling a constant-time lookup per row
+        self.alias_tables = {}
+        for col, probabilities in self.probabilities.items():
+            tables = [self.alias_table(p) for p in probabilities]
+            self.alias_tables[col] = np.array([a for a, _ in tables]), np.array([b for _, b in tables])
+        return self
+
+    def parent_codes(self, col, codes, n_rows):
+        """
+        Code of the parent's value for every row, and the number of possible parent values.
+        """
+        parent = self.parent(col)
+        if parent is None:
+            return np.zeros(n_rows, dtype=np.int64), 1
+        if parent == "duration_band":
+            duration = self.values["duration"][codes["duration"]]
+            return np.searchsorted(self.band_edges, duration, side="right"), len(self.band_edges) + 1
+        return codes[parent], len(self.values[parent])
+
+    @staticmethod
+    def alias_table(probabilities):
+        """
+        Walker/Vose alias table of one discrete distribution: (acceptance probabilities, aliases).
+        """
+        n = len(probabilities)
+        scaled = probabilities * n
+        accept = np.ones(n)
+        alias = np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            accept[s], alias[s] = scaled[s], l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+        return accept, alias
+
+    def sample(self, n_rows, seed=None):
+        """
+        A DataFrame of `n_rows` synthetic customers with the source's columns and dtypes.
+        """
+        rng = np.random.default_rng(seed)
+        codes = {}
+        for col in self.order:
+            parent_codes, _ = self.parent_codes(col, codes, n_rows)
+            accept, alias = self.alias_tables[col]
+            # Alias method: pick a slot uniformly, keep it with its acceptance probability, else take its alias
+            slots = rng.integers(0, accept.shape[1], n_rows)
+            keep = rng.random(n_rows) < accept[parent_codes, slots]
+            codes[col] = np.where(keep, slots, alias[parent_codes, slots])
+
+        frame = {}
+        for col in self.columns:
+            if isinstance(self.dtypes[col], pd.CategoricalDtype):
+                frame[col] = pd.Categorical.from_codes(codes[col], dtype=self.dtypes[col])
+            else:
+                frame[col] = self.values[col][codes[col]].astype(self.dtypes[col])
+        return pd.DataFrame(frame)
+
+    def sample_chunks(self, n_rows, chunksize=1_000_000, seed=0):
+        """
+        Yield `n_rows` rows as DataFrames of at most `chunksize` rows, the same rows generate() writes.
+        """
+        seeds = np.random.SeedSequence(seed).spawn(-(-n_rows // chunksize))
+        for start, chunk_seed in zip(range(0, n_rows, chunksize), seeds):
+            yield self.sample(min(chunksize, n_rows - start), chunk_seed)
+
+# Generator shared with worker processes through the pool initializer
+WORKER_STATE = {}
+
+def init_worker(generator):
+    WORKER_STATE["generator"] = generator
+
+def write_part(path, chunk):
+    if path.endswith(".parquet"):
+        chunk.to_parquet(path, index=False)
+        return
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        chunk.to_csv(path, index=False)
+        return
+    # pyarrow's CSV writer is several times faster than DataFrame.to_csv
+    pa_csv.write_csv(pa.Table.from_pandas(chunk, preserve_index=False), path)
+
+def generate_part(part_path, n_rows, seed):
+    write_part(part_path, WORKER_STATE["generator"].sample(n_rows, seed))
+    return part_path, n_rows
+
+def merge_parts(part_paths, output):
+    """
+    Concatenate part files into `output` in order, streaming so memory stays bounded by one row group.
+    """
+    if output.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for part in part_paths:
+                table = pq.read_table(part)
+                if writer is None:
+                    writer = pq.ParquetWriter(output, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(output, "wb") as out:
+            for i, part in enumerate(part_paths):
+                with open(part, "rb") as f:
+                    if i > 0:
+                        f.readline()  # every part has its own header
+                    shutil.copyfileobj(f, out, 16 * 1024 * 1024)
+
+def generate(generator, output, n_rows, chunksize=1_000_000, n_workers=None, seed=0, progress=None):
+    """
+    Write `n_rows` synthetic rows to `output` (.csv or .parquet), generating chunks in parallel.
+
+    Each worker samples one chunk at a time from its own spawned seed and writes it as a part file;
+    the parts are then concatenated in order. The result depends only on the seed and chunksize,
+    not on the number of workers. `progress` is called as progress(rows_done, elapsed_seconds).
+    """
+    if not output.endswith((".csv", ".parquet")):
+        raise ValueError("output must be a .csv or .parquet file")
+    sizes = [min(chunksize, n_rows - start) for start in range(0, n_rows, chunksize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    suffix = os.path.splitext(output)[1]
+    start = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output))) as tmp_dir:
+        part_paths = [os.path.join(tmp_dir, f"part-{i:05d}{suffix}") for i in range(len(sizes))]
+        n_workers = n_workers or default_workers(len(sizes))
+        done = 0
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker, initargs=(generator,)) as executor:
+            # Keep a bounded number of chunks in flight so memory does not grow with n_rows
+            pending = []
+            for part_path, size, chunk_seed in zip(part_paths, sizes, seeds):
+                pending.append(executor.submit(generate_part, part_path, size, chunk_seed))
+                if len(pending) >= 2 * n_workers:
+                    done += pending.pop(0).result()[1]
+                    if progress is not None:
+                        progress(done, time.perf_counter() - start)
+            for future in pending:
+                done += future.result()[1]
+                if progress is not None:
+                    progress(done, time.perf_counter() - start)
+
+        tmp_output = os.path.join(tmp_dir, "merged" + suffix)
+        merge_parts(part_paths, tmp_output)
+        os.replace(tmp_output, output)
+
+    elapsed = time.perf_counter() - start
+    return {"rows": n_rows, "seconds": elapsed, "rows_per_sec": n_rows / elapsed if elapsed > 0 else 0.0}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic credit customers in the training data schema.")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("rows", type=int, help="number of rows to generate")
+    parser.add_argument("--source", default=DATA_PATH, help="dataset the distributions are learned from")
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    generator = CreditDataGenerator().fit(load_dataset(args.source))
+
+    def print_progress(rows, elapsed):
+        print(f"{rows:,} rows generated ({rows / max(elapsed, 1e-9):,.0f} rows/sec)", file=sys.stderr)
+
+    stats = generate(generator, args.output, args.rows, args.chunksize, args.workers, args.seed, print_progress)
+    print(f"Wrote {stats['rows']:,} rows to {args.output} in {stats['seconds']:.1f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+
+if __name__ == "__main__":
+    main()
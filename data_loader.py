@@ -1,15 +1,270 @@
+import hashlib
+import os
 import streamlit as st
 import pandas as pd
+import numpy as np
+from pandas.api.types import union_categoricals
+from model_store import dataset_fingerprint
+from instrumentation import timed
 
-@st.cache_data
-def load_data():
-    data = pd.read_csv("credit_customers (DS).csv")
+# Under Copy-on-Write (always on from pandas 3) a shallow copy never writes through to the frame it came from
+COPY_ON_WRITE = int(pd.__version__.split(".")[0]) >= 3 or pd.get_option("mode.copy_on_write") is True
+
+CATEGORICAL_COLUMNS = ["checking_status", "credit_history", "purpose", "savings_status", "employment",
+                       "personal_status", "other_parties", "property_magnitude", "other_payment_plans",
+                       "housing", "job", "own_telephone", "foreign_worker"]
+
+DATA_PATH = "credit_customers (DS).csv"
+CACHE_DIR = "cache"
+
+# Explicit schema: low-cardinality strings as categoricals, integer-valued fields in the smallest integer type
+SCHEMA = {
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+    "class": "category",
+    "duration": "int16",
+    "credit_amount": "int32",
+    "installment_commitment": "int8",
+    "residence_since": "int8",
+    "age": "int16",
+    "existing_credits": "int8",
+    "num_dependents": "int8",
+}
+
+def iter_data_chunks(path=DATA_PATH, chunksize=100_000):
+    """
+    Stream a CSV in the dataset schema as typed DataFrames of at most `chunksize` rows.
+    """
+    yield from pd.read_csv(path, dtype=SCHEMA, chunksize=chunksize)
+
+def concat_chunks(chunks):
+    """
+    Concatenate typed chunks, merging per-chunk categories so categorical columns stay categorical.
+    """
+    chunks = list(chunks)
+    if len(chunks) == 1:
+        return chunks[0]
+    data = pd.concat(chunks, ignore_index=True)
+    for col in data.columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            data[col] = union_categoricals([chunk[col] for chunk in chunks], sort_categories=True)
     return data
 
-def preprocess_data(data):
+def source_key(path):
+    """
+    Identity of a source file: its absolute path, size and modification time.
+    """
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+def cache_path(path, cache_dir=CACHE_DIR):
+    # Files with the same name in different directories get different cache files
+    digest = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.splitext(os.path.basename(path))[0]}-{digest}.feather")
+
+def load_dataset(path=DATA_PATH, chunksize=100_000, cache_dir=CACHE_DIR):
+    """
+    Load the dataset with the typed schema.
+
+    The first load parses the CSV in chunks and writes an uncompressed Feather copy to `cache_dir`;
+    later loads memory-map that file instead of re-parsing the CSV. The cache stores the CSV's
+    source_key and is only used while it matches, so it is rebuilt whenever the CSV changes. Without
+    pyarrow the CSV is parsed on every load.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError:
+        feather = None
+
+    key = source_key(path).encode()
+    cached = cache_path(path, cache_dir)
+    if feather is not None and os.path.exists(cached):
+        table = feather.read_table(cached, memory_map=True)
+        if (table.schema.metadata or {}).get(b"source_key") == key:
+            return table.to_pandas()
+
+    data = concat_chunks(iter_data_chunks(path, chunksize))
+    if feather is not None:
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"source_key": key})
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cached}.{os.getpid()}.tmp"
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cached)
+    return data
+
+def readonly(array):
+    array.flags.writeable = False
+    return array
+
+class DatasetView:
+    """
+    Read-only dataset shared by every page and rerun, loaded once per process.
+
+    `frame` hands out copies, so a page adding or editing columns only changes its own copy: shallow
+    ones (no row data is copied) under Copy-on-Write, deep ones otherwise. Derived columns are computed once, vectorized, and exposed as
+    read-only arrays.
+    """
+
+    def __init__(self, data):
+        self._frame = data
+        self.arrays = {}
+        # 1 for a good credit risk, 0 otherwise
+        self.good = readonly((data["class"] == "good").to_numpy(dtype=np.int8))
+
+    @property
+    def frame(self):
+        return self._frame.copy(deep=not COPY_ON_WRITE)
+
+    @property
+    def columns(self):
+        return self._frame.columns
+
+    def __len__(self):
+        return len(self._frame)
+
+    def __getitem__(self, col):
+        """
+        Read-only NumPy array of one column, extracted once.
+        """
+        if col not in self.arrays:
+            self.arrays[col] = readonly(np.array(self._frame[col].to_numpy(), copy=True))
+        return self.arrays[col]
+
+class DatasetHandle:
+    """
+    Lightweight reference to a dataset that carries a precomputed fingerprint.
+
+    Cached functions take the handle instead of the DataFrame and hash only the fingerprint,
+    so a rerun with unchanged data costs O(1) instead of hashing every cell.
+    File-backed handles are fingerprinted from the file's path, size and mtime; in-memory
+    frames (from_frame) are content-hashed once when the handle is created.
+    """
+
+    def __init__(self, path=DATA_PATH):
+        self.path = path
+        self.fingerprint = source_key(path)
+        self._view = None
+
+    @classmethod
+    def from_frame(cls, data):
+        handle = cls.__new__(cls)
+        handle.path = None
+        handle.fingerprint = dataset_fingerprint(data)
+        handle._view = DatasetView(data)
+        return handle
+
+    @property
+    def view(self):
+        if self._view is None:
+            self._view = read_data(self)
+        return self._view
+
+    @property
+    def data(self):
+        return self.view.frame
+
+    def __eq__(self, other):
+        return isinstance(other, DatasetHandle) and self.fingerprint == other.fingerprint
+
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    def __repr__(self):
+        return f"DatasetHandle({self.path!r}, fingerprint={self.fingerprint!r})"
+
+# Pass to st.cache_data/st.cache_resource so handle arguments are hashed by fingerprint only
+DATASET_HASH_FUNCS = {DatasetHandle: lambda handle: handle.fingerprint}
+
+# cache_resource shares one view across sessions and reruns instead of handing each caller a deep copy
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+@timed("load_data")
+def read_data(dataset):
+    data = load_dataset(dataset.path)
+    return DatasetView(data)
+
+def get_dataset(path=DATA_PATH):
+    return DatasetHandle(path)
+
+def load_data():
+    return get_dataset().data
+
+class CategoricalEncoder:
+    """
+    One-hot encoder that learns the category vocabulary once and encodes any number of rows in one call.
+
+    The output columns match pd.get_dummies(data, columns=..., drop_first=True) on the fitted data:
+    numeric columns first, then one indicator per category with the first (sorted) category dropped.
+    Unlike get_dummies, encoding a single row uses the fitted vocabulary, so the dropped baseline
+    category is always the same one the models were trained with.
+    """
+
+    def __init__(self, categorical_columns=CATEGORICAL_COLUMNS, target="class", drop_first=True):
+        self.categorical_columns = list(categorical_columns)
+        self.target = target
+        self.drop_first = drop_first
+
+    def fit(self, data):
+        self.numeric_columns_ = [
+            col for col in data.columns if col not in self.categorical_columns and col != self.target
+        ]
+        self.categories_ = {}
+        for col in self.categorical_columns:
+            values = data[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                categories = list(values.cat.categories)
+            else:
+                categories = sorted(values.dropna().unique())
+            self.categories_[col] = categories
+
+        drop = int(self.drop_first)
+        self.feature_names_ = list(self.numeric_columns_)
+        self.offsets_ = {}
+        for col in self.categorical_columns:
+            self.offsets_[col] = len(self.feature_names_)
+            self.feature_names_ += [f"{col}_{category}" for category in self.categories_[col][drop:]]
+        return self
+
+    def transform(self, data):
+        """
+        Encode `data` into a float32 matrix with one column per entry in feature_names_.
+        Columns missing from `data` and unseen categories are encoded as zeros.
+        """
+        n_rows = len(data)
+        out = np.zeros((n_rows, len(self.feature_names_)), dtype=np.float32)
+        rows = np.arange(n_rows)
+
+        for i, col in enumerate(self.numeric_columns_):
+            if col in data:
+                out[:, i] = data[col].to_numpy(dtype=np.float32)
+
+        drop = int(self.drop_first)
+        for col in self.categorical_columns:
+            if col not in data:
+                continue
+            # Positions in the fitted vocabulary; unseen and missing values become -1
+            codes = pd.Index(self.categories_[col]).get_indexer(data[col])
+            keep = codes >= drop
+            out[rows[keep], self.offsets_[col] + codes[keep] - drop] = 1.0
+        return out
+
+    def transform_frame(self, data):
+        """
+        Encode `data` into a DataFrame, keeping the target column when present.
+        """
+        encoded = pd.DataFrame(self.transform(data), columns=self.feature_names_, index=data.index)
+        if self.target in data:
+            encoded[self.target] = data[self.target]
+        return encoded
+
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+@timed("fit_encoder")
+def get_encoder(dataset):
+    return CategoricalEncoder().fit(dataset.data)
+
+@timed("preprocess_data")
+def preprocess_data(data, encoder=None):
     # One-hot encode categorical columns
-    categorical_columns = ["checking_status", "credit_history", "purpose", "savings_status", "employment", 
-                           "personal_status", "other_parties", "property_magnitude", "other_payment_plans", 
-                           "housing", "job", "own_telephone", "foreign_worker"]
-    data = pd.get_dummies(data, columns=categorical_columns, drop_first=True)
-    return data
\ No newline at end of file
+    if encoder is None:
+        encoder = CategoricalEncoder().fit(data)
+    return encoder.transform_frame(data)
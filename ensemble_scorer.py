@@ -0,0 +1,133 @@
+import argparse
+import time
+import numpy as np
+from data_loader import DATA_PATH, load_dataset
+
+# Members whose predict_proba is cheap. SVC (kernel over the support vectors), KNN (neighbour search) and
+# the Random Forest (per-call overhead of 100 trees dominates single-row scoring) only run when these
+# do not settle the decision
+FAST_MEMBERS = ["Logistic Regression", "Decision Tree", "Gradient Boosting"]
+
+def good_column(model):
+    return list(model.classes_).index("good")
+
+class EnsembleScorer:
+    """
+    Soft-voting ensemble over the fitted models in a train_models bundle.
+
+    All members score the same encoded matrix. With the fast path enabled, the cheap members run
+    first; rows where they all agree and their mean probability of 'good' is at least `confidence`
+    (or at most 1 - `confidence`) are decided by them alone, and only the remaining rows are passed
+    to the expensive members.
+    """
+
+    def __init__(self, bundle, members=None, fast_members=FAST_MEMBERS, confidence=0.8, weights=None):
+        self.bundle = bundle
+        self.members = list(members or bundle["models"])
+        self.fast_members = [name for name in fast_members if name in self.members]
+        self.slow_members = [name for name in self.members if name not in self.fast_members]
+        self.confidence = confidence
+        self.weights = weights or {}
+
+    def member_probabilities(self, X, names):
+        """
+        Probability of 'good' from each named member, shape (n_rows, len(names)).
+        """
+        probabilities = np.empty((len(X), len(names)))
+        for i, name in enumerate(names):
+            model = self.bundle["models"][name]
+            probabilities[:, i] = model.predict_proba(X)[:, good_column(model)]
+        return probabilities
+
+    def combine(self, probabilities, names):
+        weights = np.array([self.weights.get(name, 1.0) for name in names])
+        return probabilities @ weights / weights.sum()
+
+    def predict_proba(self, X, fast=True):
+        """
+        Ensemble probability of 'good' per row of the encoded matrix `X`, and a mask of the rows
+        decided on the fast path (all False when fast=False).
+        """
+        if not fast or not self.fast_members or not self.slow_members:
+            return self.combine(self.member_probabilities(X, self.members), self.members), np.zeros(len(X), dtype=bool)
+
+        fast_probabilities = self.member_probabilities(X, self.fast_members)
+        proba = self.combine(fast_probabilities, self.fast_members)
+        votes = fast_probabilities >= 0.5
+        settled = (votes.all(axis=1) & (proba >= self.confidence)) | (~votes.any(axis=1) & (proba <= 1 - self.confidence))
+
+        rest = ~settled
+        if rest.any():
+            slow_probabilities = self.member_probabilities(X[rest], self.slow_members)
+            proba[rest] = self.combine(np.hstack([fast_probabilities[rest], slow_probabilities]),
+                                       self.fast_members + self.slow_members)
+        return proba, settled
+
+    def predict(self, X, fast=True):
+        proba, _ = self.predict_proba(X, fast)
+        return np.where(proba >= 0.5, "good", "bad")
+
+    def score_frame(self, data, fast=True):
+        """
+        Encode `data` once and return (probabilities, predictions, fast-path mask).
+        """
+        proba, settled = self.predict_proba(self.bundle["encoder"].transform(data), fast)
+        return proba, np.where(proba >= 0.5, "good", "bad"), settled
+
+def time_per_row(fn, X, repeats=5):
+    """
+    Best-of-`repeats` seconds per row for fn(X), scoring one row at a time as the prediction page does.
+    """
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for i in range(len(X)):
+            fn(X[i:i + 1])
+        best = min(best, time.perf_counter() - start)
+    return best / len(X)
+
+def compare_fast_path(scorer, X, y, repeats=3):
+    """
+    Accuracy and single-row latency of the full ensemble versus the fast path on labelled encoded rows.
+    """
+    full = scorer.predict(X, fast=False)
+    fast_proba, settled = scorer.predict_proba(X, fast=True)
+    fast = np.where(fast_proba >= 0.5, "good", "bad")
+
+    full_latency = time_per_row(lambda rows: scorer.predict_proba(rows, fast=False), X, repeats)
+    fast_latency = time_per_row(lambda rows: scorer.predict_proba(rows, fast=True), X, repeats)
+    return {
+        "rows": len(X),
+        "full_accuracy": float(np.mean(full == y)),
+        "fast_accuracy": float(np.mean(fast == y)),
+        "agreement": float(np.mean(full == fast)),
+        "fast_path_share": float(settled.mean()),
+        "full_ms_per_row": full_latency * 1000,
+        "fast_ms_per_row": fast_latency * 1000,
+        "speedup": full_latency / fast_latency,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the full soft-voting ensemble with its fast path on the test split.")
+    parser.add_argument("--train-data", default=DATA_PATH)
+    parser.add_argument("--confidence", type=float, default=0.8, help="fast-path threshold on the cheap members' mean probability")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    # Imported here: credit_risk_model imports this module for the prediction page
+    from credit_risk_model import load_models, split_data
+    from tree_export import compile_bundle
+
+    data = load_dataset(args.train_data)
+    # Time the compiled trees, as the prediction page scores with them
+    bundle = compile_bundle(load_models(data))
+    _, _, X_test, _, y_test = split_data(data)
+    report = compare_fast_path(EnsembleScorer(bundle, confidence=args.confidence), X_test, y_test, args.repeats)
+
+    print(f"{report['rows']} test rows, {report['fast_path_share']:.0%} decided on the fast path")
+    print(f"accuracy: full {report['full_accuracy']:.3f}, fast {report['fast_accuracy']:.3f} (agreement {report['agreement']:.1%})")
+    print(f"latency per row: full {report['full_ms_per_row']:.2f} ms, fast {report['fast_ms_per_row']:.2f} ms "
+          f"({report['speedup']:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,18 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from data_loader import load_data
+from aggregate_store import get_aggregates
+from data_loader import DATASET_HASH_FUNCS
+from credit_risk_model import MODEL_CLASSES, train_models
+from fairness_engine import audit_frame
+from instrumentation import timed
 
-def fairness_analysis(data):
+@st.cache_resource(hash_funcs=DATASET_HASH_FUNCS)
+@timed("audit_model")
+def audit_model(dataset, model_name):
+    return audit_frame(train_models(dataset), dataset.data, model_name)
+
+def fairness_analysis(dataset):
     """
     Perform fairness analysis to identify potential biases in the model.
     """
@@ -14,8 +23,9 @@ def fairness_analysis(data):
         "Understanding these biases is crucial for ensuring fair and ethical decision-making."
     )
 
-    # Convert 'class' to numeric values for fairness analysis
-    data["class_numeric"] = data["class"].apply(lambda x: 1 if x == "good" else 0)
+    # Shared read-only view; the numeric 'class' label is precomputed there, so nothing is copied or mutated
+    data = dataset.view
+    aggregates = get_aggregates(dataset)
 
     # Bias Analysis by Gender
     if "personal_status" in data.columns:
@@ -25,8 +35,8 @@ def fairness_analysis(data):
             "for different gender groups. This helps identify any disparities in how the model treats different genders."
         )
 
-        # Group by gender and calculate the mean credit risk score
-        bias_analysis = data.groupby("personal_status")["class_numeric"].mean()
+        # Share of good credit risks per gender group, from the streaming aggregates
+        bias_analysis = aggregates.good_rate("personal_status")
 
         # Display the bar chart
         st.bar_chart(bias_analysis)
@@ -47,12 +57,13 @@ def fairness_analysis(data):
         )
 
         # Create a scatter plot
-        fig, ax = plt.subplots()
-        sns.scatterplot(x="age", y="class_numeric", data=data, ax=ax)
-        ax.set_xlabel("Age")
-        ax.set_ylabel("Credit Risk Score")
-        ax.set_title("Credit Risk Score by Age")
-        st.pyplot(fig)
+        with timed("render:age_scatter"):
+            fig, ax = plt.subplots()
+            sns.scatterplot(x=data["age"], y=data.good, ax=ax)
+            ax.set_xlabel("Age")
+            ax.set_ylabel("Credit Risk Score")
+            ax.set_title("Credit Risk Score by Age")
+            st.pyplot(fig)
 
         # Add insights
         st.write("#### Insights")
@@ -69,8 +80,8 @@ def fairness_analysis(data):
             "This helps identify any biases related to employment."
         )
 
-        # Group by employment status and calculate the mean credit risk score
-        employment_bias = data.groupby("employment")["class_numeric"].mean()
+        # Share of good credit risks per employment status, from the streaming aggregates
+        employment_bias = aggregates.good_rate("employment")
 
         # Display the bar chart
         st.bar_chart(employment_bias)
@@ -82,6 +93,29 @@ def fairness_analysis(data):
             "- Consider whether employment status is being used appropriately in the model."
         )
 
+    # Model-Based Fairness Metrics
+    st.write("### Model-Based Fairness Metrics")
+    st.write(
+        "The tables below audit a trained model's decisions rather than the historical labels. "
+        "A decision counts as selected when the model predicts a good credit risk. "
+        "Intervals are 95% bootstrap confidence intervals. The audit covers every customer in the dataset, including the rows the model was trained on."
+    )
+    model_name = st.selectbox("Model to audit", [*MODEL_CLASSES, "ensemble"])
+    audit = audit_model(dataset, model_name)
+
+    st.write("#### Fairness Gaps by Attribute")
+    st.write(audit.summary())
+    st.write("#### Selection Rate, TPR and FPR by Group")
+    st.write(audit.group_report())
+
+    # Add insights
+    st.write("#### Insights")
+    st.write(
+        "- **Demographic Parity Difference**: The gap between the highest and lowest selection rates across groups; 0 means every group is approved at the same rate. "
+        "- **Equalized Odds Gap**: The larger of the TPR and FPR gaps across groups; 0 means the model is equally accurate for every group. "
+        "- **Disparate Impact**: The lowest selection rate divided by the highest; values below 0.8 are commonly treated as a warning sign."
+    )
+
     # General Recommendations
     st.write("### Recommendations for Reducing Bias")
     st.write(
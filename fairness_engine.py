@@ -0,0 +1,187 @@
+import argparse
+import numpy as np
+import pandas as pd
+from data_loader import DATA_PATH, load_dataset
+from credit_risk_model import load_models
+from batch_scoring import iter_chunks, score_chunk
+
+SENSITIVE_ATTRIBUTES = ["personal_status", "age_group", "employment", "foreign_worker"]
+
+AGE_BINS = [25, 35, 45, 55, 65]
+AGE_LABELS = np.array(["<25", "25-34", "35-44", "45-54", "55-64", "65+"])
+
+# Per-group sums kept by the audit, in this column order
+STATS = ["count", "selected", "true_positive", "positive", "false_positive"]
+
+def age_group(age):
+    return AGE_LABELS[np.searchsorted(AGE_BINS, np.asarray(age), side="right")]
+
+def attribute_values(data, attribute):
+    if attribute == "age_group":
+        return age_group(data["age"].to_numpy())
+    return data[attribute].to_numpy()
+
+def rates(sums):
+    """
+    Selection rate, TPR and FPR from per-group sums of shape (..., n_groups, len(STATS)).
+    """
+    count, selected, true_positive, positive, false_positive = np.moveaxis(sums, -1, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return selected / count, true_positive / positive, false_positive / (count - positive)
+
+def gaps(selection, tpr, fpr, members):
+    """
+    Demographic parity difference, equalized-odds gap and disparate impact over the groups in `members`.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s, t, f = selection[..., members], tpr[..., members], fpr[..., members]
+        parity = np.nanmax(s, axis=-1) - np.nanmin(s, axis=-1)
+        odds = np.maximum(np.nanmax(t, axis=-1) - np.nanmin(t, axis=-1), np.nanmax(f, axis=-1) - np.nanmin(f, axis=-1))
+        impact = np.nanmin(s, axis=-1) / np.nanmax(s, axis=-1)
+    return parity, odds, impact
+
+class FairnessAudit:
+    """
+    Model-based fairness metrics for every sensitive attribute, accumulated chunk by chunk.
+
+    Each update computes the per-group sums for all attributes with one set of bincounts, and the
+    Poisson bootstrap replicates with one weight-matrix product per row block, so the cost is linear
+    in the number of decisions with no Python loop over rows, groups or replicates.
+    A decision counts as 'selected' when the model predicts a good credit risk.
+    """
+
+    def __init__(self, attributes=SENSITIVE_ATTRIBUTES, n_boot=200, seed=42, block_size=50_000):
+        self.attributes = list(attributes)
+        self.n_boot = n_boot
+        self.block_size = block_size
+        self.rng = np.random.default_rng(seed)
+        self.groups = []
+        self.index = {}
+        self.sums = np.zeros((0, len(STATS)))
+        self.boot_sums = np.zeros((n_boot, 0, len(STATS)))
+
+    def group_codes(self, data):
+        """
+        Global group index of every row for every attribute, shape (n_rows, n_attributes).
+        """
+        codes = np.empty((len(data), len(self.attributes)), dtype=np.int64)
+        for a, attribute in enumerate(self.attributes):
+            local, uniques = pd.factorize(attribute_values(data, attribute))
+            mapping = np.empty(len(uniques), dtype=np.int64)
+            for i, value in enumerate(uniques):
+                key = (attribute, value)
+                if key not in self.index:
+                    self.index[key] = len(self.groups)
+                    self.groups.append(key)
+                mapping[i] = self.index[key]
+            codes[:, a] = mapping[local]
+
+        # Grow the accumulators for groups first seen in this chunk
+        extra = len(self.groups) - self.sums.shape[0]
+        if extra:
+            self.sums = np.concatenate([self.sums, np.zeros((extra, len(STATS)))])
+            self.boot_sums = np.concatenate([self.boot_sums, np.zeros((self.n_boot, extra, len(STATS)))], axis=1)
+        return codes
+
+    def update(self, data, predicted_good, actual_good):
+        predicted_good = np.asarray(predicted_good, dtype=bool)
+        actual_good = np.asarray(actual_good, dtype=bool)
+        stats = np.column_stack([
+            np.ones(len(data)), predicted_good, predicted_good & actual_good, actual_good, predicted_good & ~actual_good
+        ]).astype(np.float32)
+        codes = self.group_codes(data)
+        n_groups = len(self.groups)
+
+        # Point estimates: one bincount per statistic over all (row, attribute) pairs
+        flat = codes.ravel()
+        repeated = np.repeat(stats, len(self.attributes), axis=0)
+        for s in range(len(STATS)):
+            self.sums[:, s] += np.bincount(flat, weights=repeated[:, s], minlength=n_groups)
+
+        # Poisson bootstrap: each replicate reweights rows by Poisson(1) draws, in blocks to bound memory
+        if self.n_boot:
+            for start in range(0, len(data), self.block_size):
+                block = slice(start, start + self.block_size)
+                n_rows = len(codes[block])
+                one_hot = np.zeros((n_rows, n_groups), dtype=np.float32)
+                for a in range(len(self.attributes)):
+                    one_hot[np.arange(n_rows), codes[block, a]] = 1.0
+                per_group = (one_hot[:, :, None] * stats[block, None, :]).reshape(n_rows, -1)
+                weights = self.rng.poisson(1.0, size=(self.n_boot, n_rows)).astype(np.float32)
+                self.boot_sums += (weights @ per_group).reshape(self.n_boot, n_groups, len(STATS))
+        return self
+
+    def members(self, attribute):
+        return [i for i, (attr, _) in enumerate(self.groups) if attr == attribute]
+
+    def group_report(self, alpha=0.05):
+        """
+        Per-group counts, selection rate, TPR and FPR, with bootstrap confidence intervals.
+        """
+        selection, tpr, fpr = rates(self.sums)
+        report = pd.DataFrame({
+            "attribute": [attr for attr, _ in self.groups],
+            "group": [value for _, value in self.groups],
+            "count": self.sums[:, 0].astype(np.int64),
+            "selection_rate": selection,
+            "tpr": tpr,
+            "fpr": fpr,
+        })
+        if self.n_boot:
+            for name, boot in zip(["selection_rate", "tpr", "fpr"], rates(self.boot_sums)):
+                report[f"{name}_low"], report[f"{name}_high"] = np.nanquantile(boot, [alpha / 2, 1 - alpha / 2], axis=0)
+        order = {attr: i for i, attr in enumerate(self.attributes)}
+        rows = np.lexsort((report["group"].astype(str), report["attribute"].map(order)))
+        return report.iloc[rows].reset_index(drop=True)
+
+    def summary(self, alpha=0.05):
+        """
+        Demographic parity difference, equalized-odds gap and disparate impact per attribute, with bootstrap confidence intervals.
+        """
+        point = rates(self.sums)
+        boot = rates(self.boot_sums) if self.n_boot else None
+        rows = []
+        for attribute in self.attributes:
+            members = self.members(attribute)
+            row = {"attribute": attribute}
+            for name, value in zip(["demographic_parity_diff", "equalized_odds_gap", "disparate_impact"], gaps(*point, members)):
+                row[name] = value
+            if boot is not None:
+                for name, values in zip(["demographic_parity_diff", "equalized_odds_gap", "disparate_impact"], gaps(*boot, members)):
+                    row[f"{name}_low"], row[f"{name}_high"] = np.nanquantile(values, [alpha / 2, 1 - alpha / 2])
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+def predict_good(bundle, data, model_name):
+    """
+    Whether each row is predicted a good credit risk, by one model or by the mean-probability "ensemble".
+    """
+    if model_name == "ensemble":
+        return (score_chunk(bundle, data)["ensemble_prediction"] == "good").to_numpy()
+    return bundle["models"][model_name].predict(bundle["encoder"].transform(data)) == "good"
+
+def audit_frame(bundle, data, model_name, attributes=SENSITIVE_ATTRIBUTES, n_boot=200, seed=42):
+    audit = FairnessAudit(attributes, n_boot, seed)
+    return audit.update(data, predict_good(bundle, data, model_name), (data["class"] == "good").to_numpy())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit model decisions for group fairness over a labelled applications file.")
+    parser.add_argument("input", help="CSV or Parquet file in the training data schema, including 'class'")
+    parser.add_argument("output_prefix", help="writes <prefix>_groups.csv and <prefix>_summary.csv")
+    parser.add_argument("--model", default="Random Forest", help="model name from train_models, or 'ensemble'")
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--n-boot", type=int, default=200, help="bootstrap replicates (0 disables intervals)")
+    parser.add_argument("--train-data", default=DATA_PATH, help="dataset the stored models were trained on")
+    args = parser.parse_args(argv)
+
+    bundle = load_models(load_dataset(args.train_data))
+    audit = FairnessAudit(n_boot=args.n_boot)
+    for chunk in iter_chunks(args.input, args.chunksize):
+        audit.update(chunk, predict_good(bundle, chunk, args.model), (chunk["class"] == "good").to_numpy())
+
+    audit.group_report().to_csv(f"{args.output_prefix}_groups.csv", index=False)
+    audit.summary().to_csv(f"{args.output_prefix}_summary.csv", index=False)
+    print(audit.summary().to_string(index=False))
+
+if __name__ == "__main__":
+    main()
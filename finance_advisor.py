@@ -1,5 +1,14 @@
 import streamlit as st
 import matplotlib.pyplot as plt
+from financial_health import score_portfolio
+from instrumentation import timed
+from wealth_simulation import retirement_outlook
+
+# Keyed on the input tuple; the years slider only slices the cached bands, so moving it never re-simulates
+@st.cache_resource(max_entries=64)
+@timed("wealth_simulation")
+def wealth_outlook(income, savings, monthly_savings, years_to_retirement, retirement_years):
+    return retirement_outlook(income, savings, monthly_savings, years_to_retirement, retirement_years)
 
 def personal_finance_advisor():
     st.header("🌟 Personal Finance Advisor")
@@ -28,14 +37,24 @@ def personal_finance_advisor():
     vacation_goal = st.number_input("Vacation Savings Goal", min_value=0, value=5000)
     home_down_payment = st.number_input("Home Down Payment Goal", min_value=0, value=20000)
 
+    # The advice stays open across reruns so the simulation slider below can be moved
     if st.button("💡 Get Financial Advice"):
+        st.session_state["show_financial_advice"] = True
+    if st.session_state.get("show_financial_advice"):
+        # Scores and flags come from the same vectorized rules as the nightly portfolio run
+        health = score_portfolio({
+            "income": [income], "expenses": [expenses], "savings": [savings], "debt": [debt], "age": [age],
+            "retirement_age": [retirement_age], "emergency_fund": [emergency_fund],
+            "rent": [rent], "food": [food], "entertainment": [entertainment], "insurance": [insurance],
+        }).iloc[0]
+
         # Monthly savings
-        monthly_savings = income - expenses
+        monthly_savings = health["monthly_savings"]
         st.write(f"### 💵 Monthly Savings: **${monthly_savings:,.2f}**")
 
         # Budget Planning
         st.write("### 📑 Budget Planning")
-        if monthly_savings > 0:
+        if health["saving_money"]:
             st.success("✅ You are saving money each month. Great job!")
         else:
             st.error("❌ You are spending more than you earn. Consider reducing your expenses.")
@@ -43,7 +62,7 @@ def personal_finance_advisor():
         # Savings Goals Progress
         st.write("### 🚀 Savings Goal Progress")
         st.write(f"**Emergency Fund:**")
-        st.progress(min(savings / emergency_fund, 1.0))
+        st.progress(float(health["emergency_fund_progress"]))
 
         st.write(f"**Vacation Fund:**")
         st.progress(0)  # Starts from 0, assuming no vacation savings saved yet.
@@ -55,19 +74,20 @@ def personal_finance_advisor():
         st.write("### 📊 Expense Breakdown")
         labels = ['Rent', 'Food', 'Entertainment', 'Insurance', 'Others']
         values = [rent, food, entertainment, insurance, others]
-        fig, ax = plt.subplots()
-        ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=140)
-        ax.axis('equal')
-        st.pyplot(fig)
+        with timed("render:expense_pie"):
+            fig, ax = plt.subplots()
+            ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=140)
+            ax.axis('equal')
+            st.pyplot(fig)
 
         # Recommended Budget Comparison
         st.write("### 📏 Recommended Budget Allocation (50/30/20 Rule)")
-        needs = income * 0.50
-        wants = income * 0.30
-        savings_recommended = income * 0.20
+        needs = health["recommended_needs"]
+        wants = health["recommended_wants"]
+        savings_recommended = health["recommended_savings"]
 
-        actual_needs = rent + food + insurance
-        actual_wants = entertainment + others
+        actual_needs = health["actual_needs"]
+        actual_wants = health["actual_wants"]
         actual_savings = monthly_savings
 
         st.write(f"✅ **Needs (50%) Recommended: ${needs:,.2f} - Actual: ${actual_needs:,.2f}**")
@@ -76,54 +96,40 @@ def personal_finance_advisor():
 
         # Debt Management
         st.write("### 💳 Debt Management")
-        if debt > 0:
+        if not health["debt_free"]:
             st.warning(f"You have **${debt:,.2f}** in debt. Consider strategies like:")
             st.write("- ❄️ Snowball Method: Pay off small debts first.")
             st.write("- ⛷️ Avalanche Method: Pay off high-interest debts first.")
         else:
             st.success("✅ You are debt-free. Great job!")
 
-        # Inflation-Adjusted Retirement Planning
-        st.write("### 🏖️ Retirement Planning (with 3% inflation)")
-        years_to_retirement = retirement_age - age
-        future_income = income * (1.03 ** years_to_retirement)
-        retirement_savings_needed = future_income * 12 * (100 - retirement_age)
+        # Inflation-Adjusted Retirement Planning, over simulated return and inflation paths
+        st.write("### 🏖️ Retirement Planning (simulated returns and inflation)")
+        years_to_retirement = int(health["years_to_retirement"])
+        outlook = wealth_outlook(income, savings, monthly_savings, years_to_retirement, 100 - retirement_age)
         st.write(f"You have **{years_to_retirement} years** until retirement.")
-        st.write(f"💡 You need approximately **${retirement_savings_needed:,.2f}** to retire comfortably (adjusted for inflation).")
+        st.write(f"💡 You need approximately **${outlook['target']['p50']:,.2f}** to retire comfortably (adjusted for inflation; "
+                 f"${outlook['target']['p10']:,.0f} to ${outlook['target']['p90']:,.0f} across simulated inflation).")
+        st.write(f"📈 Probability of reaching it with your current savings rate: **{outlook['probability']:.0%}**")
 
         # Financial Health Score
         st.write("### ❤️ Financial Health Score")
-        savings_rate = (savings / income) * 100
-        debt_to_income_ratio = (debt / income) * 100
-
-        score = 100
-        if savings_rate < 20:
-            score -= 20
-        if debt_to_income_ratio > 40:
-            score -= 30
-        if savings < emergency_fund:
-            score -= 20
-
-        st.metric("🏅 Financial Health Score", score)
+        st.metric("🏅 Financial Health Score", int(health["score"]))
 
         # Future Wealth Simulator
-        st.write("### 🔮 Future Wealth Simulation (Assuming 6% annual return)")
-        future_years = st.slider("Years to simulate", 1, years_to_retirement, 10)
-        future_savings = savings
-        future_values = []
-        for _ in range(future_years):
-            future_savings = future_savings * 1.06 + (monthly_savings * 12)
-            future_values.append(future_savings)
-
-        st.line_chart(future_values)
+        st.write("### 🔮 Future Wealth Simulation (6% average annual return, 15% volatility)")
+        horizon = len(outlook["nominal"])
+        future_years = st.slider("Years to simulate", 1, horizon, min(10, horizon)) if horizon > 1 else 1
+        st.write("Percentile bands of your savings across 20,000 simulated market paths:")
+        st.line_chart(outlook["nominal"].iloc[:future_years])
 
         # Gamification: Achievements
         st.write("### 🎖️ Achievements Unlocked")
-        if savings >= 10000:
+        if health["saved_first_10k"]:
             st.write("✅ **Saved First $10,000**")
-        if debt == 0:
+        if health["debt_free"]:
             st.write("✅ **Debt-Free Champion**")
-        if savings_rate >= 30:
+        if health["savings_master"]:
             st.write("✅ **Savings Master (Savings Rate > 30%)**")
 
         # Helpful Resources
@@ -0,0 +1,206 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import sklearn
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from data_loader import load_dataset
+from model_store import dataset_fingerprint
+from credit_risk_model import MODEL_CLASSES, MODEL_PARAMS, TUNED_PARAMS_PATH, load_models, split_data
+from training_engine import default_workers
+
+SEARCH_DIR = os.path.join("artifacts", "search")
+
+# Candidate configurations per model; each is applied on top of MODEL_PARAMS
+SEARCH_SPACES = {
+    "Random Forest": [
+        {"n_estimators": n, "max_depth": depth, "min_samples_leaf": leaf}
+        for n in (200, 500) for depth in (None, 8, 16) for leaf in (1, 5)
+    ],
+    "Logistic Regression": [{"C": c} for c in (0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0)],
+    "Gradient Boosting": [
+        {"n_estimators": n, "learning_rate": rate, "max_depth": depth}
+        for n in (100, 300) for rate in (0.03, 0.1) for depth in (2, 3)
+    ],
+    "K-Nearest Neighbors": [
+        {"n_neighbors": k, "weights": weights} for k in (5, 11, 21, 31) for weights in ("uniform", "distance")
+    ],
+    "Support Vector Machine": [{"C": c, "gamma": gamma} for c in (0.1, 1.0, 10.0) for gamma in ("scale", 1e-4, 1e-5)],
+    "Decision Tree": [
+        {"max_depth": depth, "min_samples_leaf": leaf} for depth in (None, 4, 6, 8, 12) for leaf in (1, 5, 20)
+    ],
+}
+
+# Training matrix shared with worker processes through the pool initializer instead of per task
+WORKER_DATA = {}
+
+def init_worker(X, y):
+    WORKER_DATA["X"], WORKER_DATA["y"] = X, y
+
+def evaluate_fold(name, params, train_index, test_index):
+    """
+    ROC AUC of one configuration on one CV fold. Runs inside a worker process.
+    """
+    X, y = WORKER_DATA["X"], WORKER_DATA["y"]
+    model = MODEL_CLASSES[name](**{**MODEL_PARAMS[name], **params})
+    model.fit(X[train_index], y[train_index])
+    good = list(model.classes_).index("good")
+    return roc_auc_score(y[test_index] == "good", model.predict_proba(X[test_index])[:, good])
+
+def rung_budgets(n_folds, eta):
+    """
+    Number of folds evaluated at each rung, e.g. [1, 3, 5] for 5 folds and eta=3.
+    """
+    budgets = [1]
+    while budgets[-1] < n_folds:
+        budgets.append(min(n_folds, budgets[-1] * eta))
+    return budgets
+
+class FoldCache:
+    """
+    One small JSON file per (model, configuration, fold) so an interrupted search resumes where it stopped.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name, params, fold):
+        key = json.dumps([name, params, fold], sort_keys=True, default=str)
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest()[:20] + ".json")
+
+    def get(self, name, params, fold):
+        path = self.path(name, params, fold)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)["score"]
+
+    def put(self, name, params, fold, score):
+        path = self.path(name, params, fold)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"model": name, "params": params, "fold": fold, "score": score}, f, default=str)
+        os.replace(tmp_path, path)
+
+def successive_halving(X, y, search_spaces=SEARCH_SPACES, n_folds=5, eta=3, n_workers=None,
+                       cache_dir=SEARCH_DIR, progress=None, seed=42):
+    """
+    Tune every model with k-fold cross-validated successive halving.
+
+    All candidates start on one fold; after each rung only the best 1/eta by mean ROC AUC continue and are
+    evaluated on more folds, until the survivors have been scored on all `n_folds`. Fold scores are cached on
+    disk and fold evaluations from every model run concurrently in one process pool.
+    `progress` is called as progress(rung, n_rungs, n_evaluated, n_cached) after each rung.
+    Returns {model name: (best params, mean CV ROC AUC)}.
+    """
+    folds = list(StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed).split(X, y))
+    cache = FoldCache(cache_dir)
+    budgets = rung_budgets(n_folds, eta)
+    candidates = {name: list(space) for name, space in search_spaces.items()}
+    scores = {}
+
+    def config_key(params):
+        return json.dumps(params, sort_keys=True, default=str)
+
+    def mean_score(name, params, budget):
+        return np.mean([scores[(name, config_key(params), fold)] for fold in range(budget)])
+
+    with ProcessPoolExecutor(max_workers=n_workers or default_workers(os.cpu_count() or 1),
+                             initializer=init_worker, initargs=(X, y)) as executor:
+        for rung, budget in enumerate(budgets):
+            pending = {}
+            n_cached = 0
+            for name, configs in candidates.items():
+                for params in configs:
+                    for fold in range(budget):
+                        key = (name, config_key(params), fold)
+                        if key in scores:
+                            continue
+                        cached = cache.get(name, params, fold)
+                        if cached is not None:
+                            scores[key] = cached
+                            n_cached += 1
+                        else:
+                            train_index, test_index = folds[fold]
+                            pending[key] = (params, executor.submit(evaluate_fold, name, params, train_index, test_index))
+
+            for (name, params_key, fold), (params, future) in pending.items():
+                scores[(name, params_key, fold)] = future.result()
+                cache.put(name, params, fold, scores[(name, params_key, fold)])
+
+            if progress is not None:
+                progress(rung + 1, len(budgets), len(pending), n_cached)
+
+            # Keep the best 1/eta of each model's candidates for the next rung
+            if rung < len(budgets) - 1:
+                for name, configs in candidates.items():
+                    ranked = sorted(configs, key=lambda params: mean_score(name, params, budget), reverse=True)
+                    candidates[name] = ranked[:max(1, math.ceil(len(configs) / eta))]
+
+    best = {}
+    for name, configs in candidates.items():
+        winner = max(configs, key=lambda params: mean_score(name, params, n_folds))
+        best[name] = (winner, float(mean_score(name, winner, n_folds)))
+    return best
+
+def save_tuned_params(best, fingerprint, path=TUNED_PARAMS_PATH):
+    """
+    Record the winners, keeping earlier results on the same dataset for models that were not part of this search.
+    """
+    payload = {"params": {}, "cv_roc_auc": {}}
+    if os.path.exists(path):
+        with open(path) as f:
+            previous = json.load(f)
+        if previous.get("dataset") == fingerprint:
+            payload = previous
+    payload["dataset"] = fingerprint
+    payload["created"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    for name, (params, score) in best.items():
+        payload["params"][name] = params
+        payload["cv_roc_auc"][name] = score
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Write to a temporary file first so a crash mid-write never leaves a corrupt file for model_params()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune the credit risk models with cross-validated successive halving.")
+    parser.add_argument("--models", nargs="+", default=list(SEARCH_SPACES), help="models to tune (default: all)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--eta", type=int, default=3, help="keep the best 1/eta candidates at each rung")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    data = load_dataset()
+    fingerprint = dataset_fingerprint(data)
+    _, X_train, _, y_train, _ = split_data(data)
+
+    # Fold results depend on the data, the search settings, the model classes and the library version
+    classes = sorted(f"{name}={cls.__module__}.{cls.__qualname__}" for name, cls in MODEL_CLASSES.items())
+    run_key = hashlib.sha256(f"{fingerprint}:{args.folds}:{classes}:{sklearn.__version__}".encode()).hexdigest()[:16]
+
+    def print_progress(rung, n_rungs, evaluated, cached):
+        print(f"rung {rung}/{n_rungs}: {evaluated} fold fits, {cached} from cache")
+
+    spaces = {name: SEARCH_SPACES[name] for name in args.models}
+    best = successive_halving(X_train, y_train, spaces, args.folds, args.eta, args.workers,
+                              os.path.join(SEARCH_DIR, run_key), print_progress)
+    for name, (params, score) in best.items():
+        print(f"{name}: CV ROC AUC {score:.4f} with {params}")
+
+    save_tuned_params(best, fingerprint)
+
+    # Refit the artifact the prediction page loads with the winning configurations
+    load_models(data)
+
+if __name__ == "__main__":
+    main()
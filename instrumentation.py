@@ -0,0 +1,140 @@
+import contextlib
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import pandas as pd
+import streamlit as st
+
+TIMINGS_PATH = os.path.join("artifacts", "timings.json")
+
+# Process-wide totals per section name, shared by all sessions
+AGGREGATE = {}
+AGGREGATE_LOCK = threading.Lock()
+
+# Streamlit runs each session's script in its own thread, so the current rerun's records are thread-local
+CURRENT = threading.local()
+
+def rss_mb():
+    """
+    Resident memory of this process in MB; falls back to the peak RSS where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024 ** 2 if sys.platform == "darwin" else rss / 1024
+
+def start_run():
+    """
+    Begin a new rerun: later timed sections are recorded for this rerun's breakdown.
+    """
+    CURRENT.records = []
+    CURRENT.depth = 0
+    CURRENT.started = time.perf_counter()
+
+def run_records():
+    return list(getattr(CURRENT, "records", []))
+
+class timed(contextlib.ContextDecorator):
+    """
+    Time a section and record its wall time and memory delta, as a context manager or a decorator:
+
+        with timed("render:heatmap"):
+            ...
+
+        @timed("preprocess_data")
+        def preprocess_data(...):
+
+    The memory delta is the change in RSS, plus the traced allocation peak when tracemalloc is running.
+    Sections nest, and the rerun breakdown keeps their depth.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.stack = threading.local()
+
+    def __enter__(self):
+        frames = getattr(self.stack, "frames", None)
+        if frames is None:
+            frames = self.stack.frames = []
+        depth = getattr(CURRENT, "depth", 0)
+        CURRENT.depth = depth + 1
+        frames.append((time.perf_counter(), rss_mb(), depth))
+        return self
+
+    def __exit__(self, *exc):
+        start, start_rss, depth = self.stack.frames.pop()
+        seconds = time.perf_counter() - start
+        memory = rss_mb() - start_rss
+        CURRENT.depth = depth
+        record = {"name": self.name, "start": start - getattr(CURRENT, "started", start), "seconds": seconds,
+                  "memory_mb": memory, "depth": depth}
+        if tracemalloc.is_tracing():
+            record["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+
+        records = getattr(CURRENT, "records", None)
+        if records is not None:
+            records.append(record)
+        with AGGREGATE_LOCK:
+            stats = AGGREGATE.setdefault(self.name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+                                                     "total_memory_mb": 0.0, "max_memory_mb": 0.0})
+            stats["count"] += 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["total_memory_mb"] += memory
+            stats["max_memory_mb"] = max(stats["max_memory_mb"], memory)
+        return False
+
+def aggregate_frame():
+    """
+    Aggregated timings per section, slowest total first.
+    """
+    with AGGREGATE_LOCK:
+        frame = pd.DataFrame.from_dict({name: dict(stats) for name, stats in AGGREGATE.items()}, orient="index")
+    if frame.empty:
+        return frame
+    frame["mean_seconds"] = frame["total_seconds"] / frame["count"]
+    return frame.sort_values("total_seconds", ascending=False)
+
+def export_timings(path=TIMINGS_PATH):
+    """
+    Write the aggregated timings to a JSON file for offline analysis.
+    """
+    with AGGREGATE_LOCK:
+        sections = {name: dict(stats) for name, stats in AGGREGATE.items()}
+    payload = {"exported": time.strftime("%Y-%m-%dT%H:%M:%S"), "pid": os.getpid(), "sections": sections}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+def timing_panel():
+    """
+    Optional developer panel in the sidebar: this rerun's breakdown, the aggregated timings and an export button.
+    Call it at the end of the script so the rerun's sections are complete.
+    """
+    if not st.sidebar.checkbox("Developer: show timings"):
+        return
+    total = time.perf_counter() - getattr(CURRENT, "started", time.perf_counter())
+    st.sidebar.write(f"### This rerun ({total * 1000:.0f} ms)")
+    # Records are appended as sections finish; show them in the order they started
+    records = sorted(run_records(), key=lambda r: r["start"])
+    if records:
+        breakdown = pd.DataFrame({
+            "section": ["  " * r["depth"] + r["name"] for r in records],
+            "ms": [r["seconds"] * 1000 for r in records],
+            "memory MB": [r["memory_mb"] for r in records],
+        })
+        st.sidebar.dataframe(breakdown.round(1), hide_index=True)
+
+    st.sidebar.write("### All reruns")
+    st.sidebar.dataframe(aggregate_frame().round(3))
+    if st.sidebar.button("Export timings"):
+        st.sidebar.success(f"Wrote {export_timings()}")
@@ -1,4 +1,5 @@
 import streamlit as st
+from loan_rules import get_engine
 
 def loan_recommendations():
     """
@@ -24,8 +25,12 @@ def loan_recommendations():
                                 ["Personal Use", "Home Purchase/Renovation", "Car Purchase", "Education", "Business"], 
                                 help="Select the purpose of the loan.")
 
-    # Calculate disposable income
-    disposable_income = income - expenses
+    # Eligibility and borrowing limits come from the rule table, reloaded whenever loan_rules.json changes
+    engine = get_engine()
+    assessment = engine.evaluate({
+        "income": [income], "expenses": [expenses], "savings": [savings],
+        "credit_score": [credit_score], "purpose": [loan_purpose],
+    }).iloc[0]
 
     # Loan eligibility criteria
     st.subheader("Loan Eligibility")
@@ -33,12 +38,9 @@ def loan_recommendations():
         "Based on your financial profile, here's an assessment of your loan eligibility:"
     )
 
-    if disposable_income > 1000 and credit_score >= 650:
-        st.success("✅ You are eligible for most loan products.")
-    elif disposable_income > 500 and credit_score >= 600:
-        st.warning("⚠️ You are eligible for some loan products, but with higher interest rates.")
-    else:
-        st.error("❌ You may not be eligible for most loan products at this time.")
+    tier = engine.tiers[engine.tier_names.index(assessment["tier"])]
+    show = {"success": st.success, "warning": st.warning}.get(tier["level"], st.error)
+    show(tier["message"])
 
     # Personalized loan recommendations
     st.subheader("Personalized Loan Recommendations")
@@ -46,39 +48,12 @@ def loan_recommendations():
         "Based on your financial profile and loan purpose, here are some recommended loan products:"
     )
 
-    if loan_purpose == "Personal Use":
-        st.write("- **Personal Loan**: Ideal for short-term financial needs like vacations, weddings, or medical expenses.")
-        st.write("- **Line of Credit**: Flexible borrowing option for ongoing expenses.")
+    purpose = engine.purposes.get(loan_purpose)
+    if purpose is not None:
+        for product, description in purpose["products"]:
+            st.write(f"- **{product}**: {description}")
         st.write(
-            f"**Eligibility**: You can borrow up to **${disposable_income * 12:.2f}** (12 months of disposable income)."
-        )
-
-    elif loan_purpose == "Home Purchase/Renovation":
-        st.write("- **Home Loan**: Best for purchasing or renovating a home.")
-        st.write("- **Home Equity Loan**: Use the equity in your home to borrow at lower interest rates.")
-        st.write(
-            f"**Eligibility**: You can borrow up to **${savings * 5:.2f}** (5 times your savings)."
-        )
-
-    elif loan_purpose == "Car Purchase":
-        st.write("- **Car Loan**: Perfect for buying a new or used car.")
-        st.write("- **Lease Financing**: Flexible option for driving a new car without owning it.")
-        st.write(
-            f"**Eligibility**: You can borrow up to **${disposable_income * 24:.2f}** (24 months of disposable income)."
-        )
-
-    elif loan_purpose == "Education":
-        st.write("- **Education Loan**: Designed to cover tuition fees and other educational expenses.")
-        st.write("- **Scholarship/Grant**: Explore free funding options for education.")
-        st.write(
-            f"**Eligibility**: You can borrow up to **${savings * 3:.2f}** (3 times your savings)."
-        )
-
-    elif loan_purpose == "Business":
-        st.write("- **Business Loan**: Ideal for starting or expanding a business.")
-        st.write("- **Small Business Grant**: Explore free funding options for small businesses.")
-        st.write(
-            f"**Eligibility**: You can borrow up to **${disposable_income * 36:.2f}** (36 months of disposable income)."
+            f"**Eligibility**: You can borrow up to **${assessment['max_amount']:.2f}** ({purpose['description']})."
         )
 
     # Tips for improving eligibility
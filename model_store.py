@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import time
+import joblib
+import pandas as pd
+import sklearn
+
+ARTIFACT_DIR = "artifacts"
+
+# Bump when the layout of the saved bundle changes so older artifacts are never loaded
+ARTIFACT_VERSION = 2
+
+def dataset_fingerprint(data):
+    """
+    Content fingerprint of a DataFrame: column names, dtypes and every cell value.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in data.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()
+
+def artifact_key(fingerprint, params, model_classes=None):
+    """
+    Key an artifact by dataset fingerprint, hyperparameters, model classes, bundle layout and scikit-learn version.
+    """
+    classes = {name: f"{cls.__module__}.{cls.__qualname__}" for name, cls in (model_classes or {}).items()}
+    payload = json.dumps(
+        {"data": fingerprint, "params": params, "classes": classes, "version": ARTIFACT_VERSION,
+         "sklearn": sklearn.__version__},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+def artifact_path(key, directory=ARTIFACT_DIR):
+    return os.path.join(directory, f"credit_models_{key}.joblib")
+
+def save_artifacts(key, bundle, directory=ARTIFACT_DIR):
+    os.makedirs(directory, exist_ok=True)
+    path = artifact_path(key, directory)
+
+    # Write to a temporary file first so a crashed save never leaves a half-written artifact behind
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(bundle, tmp_path)
+    os.replace(tmp_path, path)
+
+    metadata = {
+        "key": key,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sklearn": sklearn.__version__,
+        "models": list(bundle["models"]),
+        "n_features": len(bundle["columns"]),
+    }
+    with open(os.path.join(directory, f"credit_models_{key}.json"), "w") as f:
+        json.dump(metadata, f, indent=2)
+    return path
+
+def load_artifacts(key, directory=ARTIFACT_DIR):
+    path = artifact_path(key, directory)
+    if not os.path.exists(path):
+        return None
+    try:
+        return joblib.load(path)
+    except Exception:
+        # A corrupt or incompatible artifact is treated as a cache miss
+        return None
+
+def load_or_train(data, train_fn, params, retrain=False, directory=ARTIFACT_DIR, model_classes=None, fingerprint=None):
+    """
+    Return the artifact bundle for (data, params, model_classes), fitting and saving it only when missing or when retrain=True.
+    Pass `fingerprint` when the caller has already computed dataset_fingerprint(data).
+    """
+    key = artifact_key(fingerprint or dataset_fingerprint(data), params, model_classes)
+    if not retrain:
+        bundle = load_artifacts(key, directory)
+        if bundle is not None:
+            return bundle
+
+    bundle = train_fn(data, params)
+    save_artifacts(key, bundle, directory)
+    return bundle
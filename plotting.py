@@ -0,0 +1,117 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+DEFAULT_POINT_BUDGET = 2000
+
+def histogram_counts(values, bins=20, value_range=None):
+    """
+    Fixed-bin histogram of `values`. Returns (counts, edges).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if value_range is None:
+        value_range = (np.nanmin(values), np.nanmax(values))
+    return np.histogram(values[~np.isnan(values)], bins=bins, range=value_range)
+
+def grouped_histogram_counts(values, labels, bins=20, value_range=None):
+    """
+    Histogram counts per label on shared bin edges. Returns ({label: counts}, edges).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    labels = np.asarray(labels)
+    _, edges = histogram_counts(values, bins, value_range)
+    return {label: np.histogram(values[labels == label], bins=edges)[0] for label in np.unique(labels)}, edges
+
+def binned_counts_2d(x, y, labels=None, bins=30):
+    """
+    2D bin counts of (x, y), per label when labels are given. Returns ({label: counts}, x_edges, y_edges);
+    without labels the single key is None.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    _, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    if labels is None:
+        return {None: np.histogram2d(x, y, bins=[x_edges, y_edges])[0]}, x_edges, y_edges
+    labels = np.asarray(labels)
+    counts = {
+        label: np.histogram2d(x[labels == label], y[labels == label], bins=[x_edges, y_edges])[0]
+        for label in np.unique(labels)
+    }
+    return counts, x_edges, y_edges
+
+def stratified_sample(labels, budget=DEFAULT_POINT_BUDGET, random_state=42):
+    """
+    Row indices of a sample of at most `budget` rows, allocated to each label in proportion to its size
+    (at least one row per label), so small groups stay visible in scatter views.
+    """
+    labels = np.asarray(labels)
+    if len(labels) <= budget:
+        return np.arange(len(labels))
+    rng = np.random.default_rng(random_state)
+    groups, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    quotas = np.maximum(1, np.floor(sizes / len(labels) * budget).astype(int))
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    picks = [
+        rng.choice(order[start:start + size], size=min(quota, size), replace=False)
+        for start, size, quota in zip(starts, sizes, quotas)
+    ]
+    return np.sort(np.concatenate(picks))
+
+def smooth_counts(counts, width=1.5):
+    """
+    Gaussian-smoothed bin counts, used as a cheap stand-in for a KDE curve.
+    """
+    radius = int(np.ceil(3 * width))
+    kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / width) ** 2)
+    kernel /= kernel.sum()
+    return np.convolve(np.pad(counts.astype(float), radius, mode="edge"), kernel, mode="valid")
+
+def plot_histogram(counts, edges, ax, color="skyblue", smooth=True):
+    """
+    Draw a histogram from precomputed counts, optionally with a smoothed density line.
+    """
+    centers = (edges[:-1] + edges[1:]) / 2
+    ax.bar(centers, counts, width=np.diff(edges), color=color, edgecolor="white", alpha=0.8)
+    if smooth:
+        ax.plot(centers, smooth_counts(counts), color=color, linewidth=2)
+
+def plot_cluster_grid(data, features, hue, budget=DEFAULT_POINT_BUDGET, bins=30, palette="viridis"):
+    """
+    Pair-plot style grid whose render cost does not grow with the number of rows.
+
+    Diagonal: per-cluster histograms from bin counts. Lower triangle: a stratified sample of at most
+    `budget` points. Upper triangle: 2D bin counts of all rows.
+    """
+    labels = data[hue].to_numpy()
+    groups = np.unique(labels)
+    colors = plt.get_cmap(palette)(np.linspace(0, 1, max(len(groups), 2)))
+    sample = stratified_sample(labels, budget)
+
+    n = len(features)
+    fig, axes = plt.subplots(n, n, figsize=(3 * n, 3 * n))
+    for i, y_feature in enumerate(features):
+        for j, x_feature in enumerate(features):
+            ax = axes[i, j]
+            x = data[x_feature].to_numpy()
+            if i == j:
+                counts, edges = grouped_histogram_counts(x, labels, bins)
+                centers = (edges[:-1] + edges[1:]) / 2
+                for group, color in zip(groups, colors):
+                    ax.step(centers, counts[group], where="mid", color=color, label=str(group))
+            elif i > j:
+                y = data[y_feature].to_numpy()
+                for group, color in zip(groups, colors):
+                    rows = sample[labels[sample] == group]
+                    ax.scatter(x[rows], y[rows], s=6, color=color, alpha=0.6)
+            else:
+                y = data[y_feature].to_numpy()
+                counts, x_edges, y_edges = binned_counts_2d(x, y, bins=bins)
+                ax.pcolormesh(x_edges, y_edges, counts[None].T, cmap="Greys")
+            if i == n - 1:
+                ax.set_xlabel(x_feature)
+            if j == 0:
+                ax.set_ylabel(y_feature)
+
+    axes[0, 0].legend(title=hue, fontsize="small")
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+from data_loader import load_dataset
+from credit_risk_model import load_models
+from batch_scoring import score_encoded
+from tree_export import compile_bundle
+
+class MicroBatcher:
+    """
+    Collect concurrent scoring requests and score them together with one predict_proba call per model.
+
+    A batch is flushed when it reaches max_batch_size records or when the oldest record has waited max_wait_ms.
+    Records are queued already encoded. If scoring a batch fails, its rows are rescored one by one so
+    only the rows that caused the failure get the exception.
+    """
+
+    def __init__(self, bundle, max_batch_size=64, max_wait_ms=5.0, latency_window=10_000):
+        self.bundle = bundle
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = None
+        self.worker = None
+        self.latencies = deque(maxlen=latency_window)
+        self.batches = 0
+        self.records = 0
+
+    def start(self):
+        if self.worker is None:
+            self.queue = asyncio.Queue()
+            self.worker = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+
+    async def score(self, X):
+        """
+        Queue the rows of an encoded matrix and wait for their scores.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for row in X:
+            future = loop.create_future()
+            await self.queue.put((row, future, time.perf_counter()))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    def score_batch(self, rows):
+        """
+        Score records for a batch: a list of (record, None) or (None, exception) per row.
+        """
+        try:
+            return [(record, None) for record in score_encoded(self.bundle, np.vstack(rows)).to_dict(orient="records")]
+        except Exception:
+            if len(rows) == 1:
+                raise
+        results = []
+        for row in rows:
+            try:
+                results.append((score_encoded(self.bundle, row[None, :]).to_dict(orient="records")[0], None))
+            except Exception as exc:
+                results.append((None, exc))
+        return results
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            rows = [row for row, _, _ in batch]
+            try:
+                # Score off the event loop so new requests keep queueing while the models run
+                results = await loop.run_in_executor(None, self.score_batch, rows)
+            except Exception as exc:
+                results = [(None, exc)]
+
+            now = time.perf_counter()
+            for (_, future, queued), (record, exc) in zip(batch, results):
+                self.latencies.append(now - queued)
+                if future.done():
+                    continue
+                if exc is not None:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(record)
+            self.batches += 1
+            self.records += len(batch)
+
+    def metrics(self):
+        latencies_ms = np.asarray(self.latencies) * 1000.0
+        return {
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "batches": self.batches,
+            "records": self.records,
+            "mean_batch_size": self.records / self.batches if self.batches else 0.0,
+            "latency_p50_ms": float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else None,
+            "latency_p99_ms": float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else None,
+        }
+
+def is_number(value):
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return False
+    return isinstance(value, (int, float)) and math.isfinite(value)
+
+def encode_applicants(encoder, applicants):
+    """
+    Validate applicant dicts against the encoder's input fields and encode them.
+
+    Returns (matrix, None), or (None, problems) with the missing and invalid fields of every invalid
+    applicant, so one bad record is rejected up front instead of failing the micro-batch it lands in.
+    A field is invalid when a numeric one is not a number or a categorical one is not in the training
+    vocabulary, which the encoder would otherwise silently encode as all zeros.
+    """
+    fields = encoder.numeric_columns_ + encoder.categorical_columns
+    problems = []
+    for i, applicant in enumerate(applicants):
+        missing = [col for col in fields if applicant.get(col) is None]
+        invalid = [col for col in encoder.numeric_columns_ if col not in missing and not is_number(applicant[col])]
+        invalid += [col for col in encoder.categorical_columns
+                    if col not in missing and applicant[col] not in encoder.categories_[col]]
+        if missing or invalid:
+            problems.append({"index": i, "missing": missing, "invalid": invalid})
+    if problems:
+        return None, problems
+    return encoder.transform(pd.DataFrame(applicants, columns=fields)), None
+
+async def read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return body
+
+async def send_json(send, status, payload):
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+def create_app(bundle=None, max_batch_size=None, max_wait_ms=None):
+    """
+    Build the ASGI scoring app.
+
+    Routes:
+      POST /score    one applicant object or a list of them, in the training data schema; 400 with the
+                     missing, non-numeric or unknown-category fields of each invalid applicant
+      GET  /metrics  latency percentiles, queue depth and batch statistics
+      GET  /health   liveness check
+    When `bundle` is None the models are loaded from the artifact store at startup.
+    """
+    max_batch_size = max_batch_size or int(os.environ.get("SCORING_MAX_BATCH", 64))
+    max_wait_ms = max_wait_ms if max_wait_ms is not None else float(os.environ.get("SCORING_MAX_WAIT_MS", 5))
+    state = {"batcher": None}
+
+    def get_batcher():
+        if state["batcher"] is None:
+            model_bundle = bundle if bundle is not None else load_models(load_dataset())
+            # Micro-batches are small, where the exported trees avoid scikit-learn's per-call overhead
+            state["batcher"] = MicroBatcher(compile_bundle(model_bundle, max_batch_size), max_batch_size, max_wait_ms)
+        return state["batcher"]
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    get_batcher().start()
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    if state["batcher"] is not None:
+                        await state["batcher"].stop()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] != "http":
+            return
+
+        path, method = scope["path"], scope["method"]
+        if path == "/health" and method == "GET":
+            await send_json(send, 200, {"status": "ok"})
+        elif path == "/metrics" and method == "GET":
+            await send_json(send, 200, get_batcher().metrics())
+        elif path == "/score" and method == "POST":
+            try:
+                payload = json.loads(await read_body(receive))
+            except ValueError:
+                await send_json(send, 400, {"error": "request body must be JSON"})
+                return
+            applicants = payload if isinstance(payload, list) else [payload]
+            if not applicants or not all(isinstance(a, dict) for a in applicants):
+                await send_json(send, 400, {"error": "expected an applicant object or a list of them"})
+                return
+            batcher = get_batcher()
+            X, problems = encode_applicants(batcher.bundle["encoder"], applicants)
+            if problems is not None:
+                await send_json(send, 400, {"error": "invalid applicant fields", "applicants": problems})
+                return
+            try:
+                scores = await batcher.score(X)
+            except Exception as exc:
+                await send_json(send, 500, {"error": f"scoring failed: {exc}"})
+                return
+            await send_json(send, 200, scores if isinstance(payload, list) else scores[0])
+        else:
+            await send_json(send, 404, {"error": "not found"})
+
+    return app
+
+# Run with: uvicorn scoring_service:app
+app = create_app()
@@ -0,0 +1,107 @@
+import os
+import joblib
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+from data_loader import CategoricalEncoder
+
+SEGMENT_MODEL_PATH = os.path.join("artifacts", "segmentation.joblib")
+
+def frame_chunks(data, chunksize):
+    for start in range(0, len(data), chunksize):
+        yield data.iloc[start:start + chunksize]
+
+class SegmentationEngine:
+    """
+    Customer segmentation with a streaming StandardScaler and MiniBatchKMeans.
+
+    Fitting makes one pass over the chunks to learn the scaler, then `epochs` passes of
+    partial_fit for the centroids, so memory is bounded by the chunk size. New customers are
+    assigned to the nearest stored centroid without refitting.
+    """
+
+    def __init__(self, encoder=None, n_clusters=3, batch_size=4096, random_state=42):
+        self.encoder = encoder
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.scaler = None
+        self.kmeans = None
+        self.source = None
+        self.assignments = None
+
+    def fit_chunks(self, make_chunks, epochs=3):
+        """
+        Fit on the chunks produced by make_chunks(), a callable returning a fresh iterator of DataFrames.
+        Needs a fitted encoder: one fitted on the first chunk would encode categories that first appear
+        in later chunks as zeros.
+        """
+        if self.encoder is None:
+            raise ValueError("fit_chunks needs an encoder fitted on the full vocabulary")
+        self.scaler = StandardScaler()
+        for chunk in make_chunks():
+            self.scaler.partial_fit(self.encoder.transform(chunk))
+
+        self.kmeans = MiniBatchKMeans(n_clusters=self.n_clusters, batch_size=self.batch_size,
+                                      random_state=self.random_state)
+        for _ in range(epochs):
+            for chunk in make_chunks():
+                X = self.scaler.transform(self.encoder.transform(chunk))
+                # partial_fit initialises the centroids from the first batch, which needs at least n_clusters rows
+                if len(X) >= self.n_clusters:
+                    self.kmeans.partial_fit(X)
+        return self
+
+    def fit(self, data, chunksize=100_000, epochs=3):
+        if self.encoder is None:
+            self.encoder = CategoricalEncoder().fit(data)
+        return self.fit_chunks(lambda: frame_chunks(data, chunksize), epochs)
+
+    def assign(self, records):
+        """
+        Return the segment of every row in `records` (a DataFrame in the dataset schema).
+        """
+        X = self.scaler.transform(self.encoder.transform(records))
+        return self.kmeans.predict(X).astype(np.int8)
+
+    def assign_chunks(self, chunks):
+        return np.concatenate([self.assign(chunk) for chunk in chunks])
+
+    @property
+    def centroids(self):
+        """
+        Cluster centres in the original (unscaled) feature units.
+        """
+        return self.scaler.inverse_transform(self.kmeans.cluster_centers_)
+
+    def save(self, path=SEGMENT_MODEL_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(self.__dict__, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=SEGMENT_MODEL_PATH):
+        engine = cls.__new__(cls)
+        engine.__dict__.update(joblib.load(path))
+        return engine
+
+def load_or_fit_segments(data, fingerprint, encoder=None, path=SEGMENT_MODEL_PATH, chunksize=100_000):
+    """
+    Return the segmentation engine for a dataset, with `assignments` holding every row's segment.
+
+    The fitted scaler, centroids and assignments are persisted and reused as long as the dataset fingerprint matches.
+    """
+    if os.path.exists(path):
+        try:
+            engine = SegmentationEngine.load(path)
+        except Exception:
+            engine = None
+        if engine is not None and engine.source == fingerprint:
+            return engine
+
+    engine = SegmentationEngine(encoder).fit(data, chunksize)
+    engine.assignments = engine.assign_chunks(frame_chunks(data, chunksize))
+    engine.source = fingerprint
+    engine.save(path)
+    return engine
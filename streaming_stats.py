@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+class Moments:
+    """
+    Per-column count, mean, variance, min and max, updated batch by batch (Welford/Chan).
+
+    Two instances built over different chunks or in different processes can be merged and give the
+    same result as a single pass over all the data.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+
+    def update(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[:, None]
+        if len(X) == 0:
+            return self
+        batch = Moments()
+        batch.n = len(X)
+        batch.mean = X.mean(axis=0)
+        batch.m2 = ((X - batch.mean) ** 2).sum(axis=0)
+        batch.min = X.min(axis=0)
+        batch.max = X.max(axis=0)
+        return self.merge(batch)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean.copy(), other.m2.copy()
+            self.min, self.max = other.min.copy(), other.max.copy()
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.n / n
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.n * other.n / n
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.n = n
+        return self
+
+    def variance(self, ddof=1):
+        return self.m2 / (self.n - ddof)
+
+    def std(self, ddof=1):
+        return np.sqrt(self.variance(ddof))
+
+class CoMoments:
+    """
+    Mean vector and co-moment matrix of several columns, updated batch by batch and mergeable.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = None
+        self.comoment = None
+
+    def update(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) == 0:
+            return self
+        batch = CoMoments()
+        batch.n = len(X)
+        batch.mean = X.mean(axis=0)
+        centered = X - batch.mean
+        batch.comoment = centered.T @ centered
+        return self.merge(batch)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.comoment = other.n, other.mean.copy(), other.comoment.copy()
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.n = n
+        return self
+
+    def cov(self, ddof=1):
+        return self.comoment / (self.n - ddof)
+
+    def corr(self):
+        cov = self.cov()
+        std = np.sqrt(np.diag(cov))
+        return cov / np.outer(std, std)
+
+class TDigest:
+    """
+    Mergeable quantile sketch (merging t-digest with the arcsine scale function).
+
+    Keeps at most about `compression` weighted centroids; centroids near the tails stay small,
+    so extreme quantiles are more accurate than the median.
+    """
+
+    def __init__(self, compression=500):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def n(self):
+        return self.weights.sum()
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def merge(self, other):
+        if len(other.weights) == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # Points whose left cumulative quantile falls in the same unit of the scale function share a centroid
+        q_left = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+        groups = np.floor(k - k[0]).astype(np.int64)
+        groups = np.unique(groups, return_inverse=True)[1]
+
+        merged_weights = np.bincount(groups, weights=weights)
+        self.means = np.bincount(groups, weights=means * weights) / merged_weights
+        self.weights = merged_weights
+
+    def quantile(self, q):
+        if len(self.weights) == 0:
+            return np.nan
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(q) * total, positions, values)
+
+class GroupedCounter:
+    """
+    Per-group record and positive counts (e.g. 'good' credit outcomes), updated batch by batch and mergeable.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.positives = {}
+
+    def update(self, groups, positive):
+        groups = pd.Series(np.asarray(groups))
+        codes, uniques = pd.factorize(groups)
+        valid = codes >= 0
+        counts = np.bincount(codes[valid], minlength=len(uniques))
+        positives = np.bincount(codes[valid], weights=np.asarray(positive, dtype=np.float64)[valid], minlength=len(uniques))
+        for group, count, hits in zip(uniques, counts, positives):
+            self.counts[group] = self.counts.get(group, 0) + int(count)
+            self.positives[group] = self.positives.get(group, 0) + int(hits)
+        return self
+
+    def merge(self, other):
+        for group, count in other.counts.items():
+            self.counts[group] = self.counts.get(group, 0) + count
+            self.positives[group] = self.positives.get(group, 0) + other.positives[group]
+        return self
+
+    def rate(self):
+        """
+        Share of positives per group, sorted by group, like data.groupby(groups)[positive].mean().
+        """
+        groups = sorted(self.counts)
+        return pd.Series([self.positives[g] / self.counts[g] for g in groups], index=groups)
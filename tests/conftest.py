@@ -0,0 +1,37 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def mixed_csv(tmp_path):
+    """
+    Write a frame to CSV with `columns` holding integers except in the last `n_decimal` rows, so a reader
+    that types columns from its first block fails on a later one. Returns the path.
+    """
+    def write(data, columns, n_decimal=10):
+        data = data.copy()
+        for col in columns:
+            values = data[col].round().astype(np.int64).astype(object)
+            values.iloc[-n_decimal:] += 0.5
+            data[col] = values
+        path = tmp_path / "mixed.csv"
+        data.to_csv(path, index=False)
+        return str(path)
+    return write
+
+@pytest.fixture(params=[".csv", ".parquet"])
+def run_cli(request, tmp_path, capsys):
+    """
+    Run a file-scoring CLI's main() with .csv or .parquet output; returns (stdout, output frame).
+    """
+    def run(main, input_path, *args):
+        output = str(tmp_path / f"output{request.param}")
+        main([input_path, output, *args])
+        frame = pd.read_csv(output) if request.param == ".csv" else pd.read_parquet(output)
+        return capsys.readouterr().out, frame
+    return run
@@ -0,0 +1,15 @@
+import warnings
+import numpy as np
+import pandas as pd
+from data_loader import CategoricalEncoder
+
+def test_unseen_categories_encode_as_zeros_without_warning():
+    train = pd.DataFrame({"age": [30, 40, 50], "housing": ["own", "rent", "for free"], "class": ["good", "bad", "good"]})
+    encoder = CategoricalEncoder(["housing"]).fit(train)
+    data = pd.DataFrame({"age": [20, 60, 70], "housing": ["rent", "boat", None]})
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        X = encoder.transform(data)
+    # Vocabulary is sorted and its first entry dropped: housing_own, housing_rent
+    assert encoder.feature_names_ == ["age", "housing_own", "housing_rent"]
+    np.testing.assert_array_equal(X, [[20, 0, 1], [60, 0, 0], [70, 0, 0]])
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+from financial_health import iter_input, main, score_portfolio, synthetic_customers
+
+def test_csv_types_do_not_depend_on_the_first_block(mixed_csv):
+    path = mixed_csv(synthetic_customers(5_000, seed=1), ["income"])
+    # chunksize=50 makes blocks of about 5 kB, so the decimals are many blocks after the first
+    chunks = list(iter_input(path, chunksize=50))
+    assert len(chunks) > 5
+    assert sum(len(chunk) for chunk in chunks) == 5_000
+    assert all(chunk["income"].dtype == np.float64 for chunk in chunks)
+
+def test_cli_scores_mixed_csv(mixed_csv, run_cli):
+    path = mixed_csv(synthetic_customers(5_000, seed=1), ["income"])
+    out, scores = run_cli(main, path, "--chunksize", "50")
+    assert "Scored 5,000 rows" in out
+
+    expected = score_portfolio(pd.read_csv(path))
+    np.testing.assert_array_equal(scores["score"].to_numpy(), expected["score"].to_numpy())
+    np.testing.assert_allclose(scores["savings_rate"].to_numpy(), expected["savings_rate"].to_numpy())
+    assert scores["customer_id"].tolist() == list(range(5_000))
+
+def test_zero_income_gives_nan_rates_without_penalty():
+    scores = score_portfolio({"income": [0, 5000], "expenses": [100, 3000], "savings": [20000, 20000],
+                              "debt": [0, 0], "age": [30, 30]})
+    assert np.isnan(scores["savings_rate"][0])
+    assert scores["score"].tolist() == [100, 100]
@@ -0,0 +1,41 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from loan_rules import RULES_PATH, get_engine, load_rules, main, synthetic_profiles
+
+def test_cli_evaluates_mixed_csv(mixed_csv, run_cli):
+    path = mixed_csv(synthetic_profiles(5_000, load_rules().purpose_names, seed=1), ["income", "credit_score"])
+    out, result = run_cli(main, path, "--chunksize", "50")
+    assert "Evaluated 5,000 profiles" in out
+
+    expected = load_rules().evaluate(pd.read_csv(path))
+    assert result["tier"].astype(str).tolist() == expected["tier"].astype(str).tolist()
+    np.testing.assert_allclose(result["max_amount"].to_numpy(), expected["max_amount"].to_numpy())
+
+def test_rules_match_the_original_thresholds():
+    engine = load_rules()
+    result = engine.evaluate({
+        "income": [5000, 3000, 3000, 3000],
+        "expenses": [3000, 2400, 2400, 2900],
+        "savings": [1000, 1000, 1000, 1000],
+        "credit_score": [650, 600, 599, 800],
+        "purpose": ["Personal Use", "Home Purchase/Renovation", "Business", "Unknown"],
+    })
+    assert result["tier"].tolist() == ["most", "some", "none", "none"]
+    np.testing.assert_array_equal(result["max_amount"].to_numpy(), [24000, 5000, 21600, np.nan])
+
+def test_engine_reloads_when_the_rules_file_changes(tmp_path):
+    with open(RULES_PATH) as f:
+        spec = json.load(f)
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(spec))
+    profile = {"income": [3000], "expenses": [1000], "savings": [0], "credit_score": [700], "purpose": ["Business"]}
+    assert get_engine(str(path)).evaluate(profile)["max_amount"][0] == 72000
+
+    spec["purposes"]["Business"]["multiplier"] = 48
+    path.write_text(json.dumps(spec))
+    # Make the change visible even on filesystems with coarse modification times
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert get_engine(str(path)).evaluate(profile)["max_amount"][0] == 96000
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from data_loader import CategoricalEncoder, load_dataset
+from tree_export import ExportedTrees, LowLatencyModel, load_export, save_export
+
+@pytest.fixture(scope="module")
+def credit_data(tmp_path_factory):
+    data = load_dataset(cache_dir=str(tmp_path_factory.mktemp("cache")))
+    X = CategoricalEncoder().fit(data).transform(data)
+    return X, data["class"].to_numpy()
+
+MODELS = {
+    "decision_tree": lambda: DecisionTreeClassifier(max_depth=6, random_state=0),
+    "random_forest": lambda: RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0),
+    "gradient_boosting": lambda: GradientBoostingClassifier(n_estimators=25, max_depth=3, random_state=0),
+}
+
+@pytest.mark.parametrize("name", list(MODELS))
+def test_exported_probabilities_are_bit_identical(credit_data, name):
+    X, y = credit_data
+    model = MODELS[name]().fit(X[:800], y[:800])
+    exported = ExportedTrees.from_model(model)
+
+    for rows in (X, X[800:], X[:1]):
+        # Exact equality, not allclose: the export must reproduce scikit-learn's arithmetic
+        np.testing.assert_array_equal(exported.predict_proba(rows), model.predict_proba(rows))
+    np.testing.assert_array_equal(exported.predict(X), model.predict(X))
+
+@pytest.mark.parametrize("name", list(MODELS))
+def test_saved_export_round_trips(credit_data, name, tmp_path):
+    X, y = credit_data
+    model = MODELS[name]().fit(X, y)
+    path = str(tmp_path / "export.npz")
+    save_export({name: ExportedTrees.from_model(model)}, path)
+
+    loaded = load_export(path)[name]
+    np.testing.assert_array_equal(loaded.predict_proba(X), model.predict_proba(X))
+
+def test_low_latency_model_matches_on_both_paths(credit_data):
+    X, y = credit_data
+    model = MODELS["random_forest"]().fit(X, y)
+    fast = LowLatencyModel(model, ExportedTrees.from_model(model), max_rows=32)
+    np.testing.assert_array_equal(fast.predict_proba(X[:5]), model.predict_proba(X[:5]))
+    np.testing.assert_array_equal(fast.predict_proba(X), model.predict_proba(X))
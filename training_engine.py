@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# Queue on which pool workers announce (name, pid, start time) when they pick up a model
+WORKER_STATE = {}
+
+def init_worker(started_queue):
+    WORKER_STATE["started"] = started_queue
+
+def fit_in_worker(name, *args):
+    WORKER_STATE["started"].put((name, os.getpid(), time.time()))
+    return fit_and_evaluate(name, *args)
+
+def fit_and_evaluate(name, model_class, params, X_train, y_train, X_test, y_test, evaluate):
+    """
+    Fit a single model and compute its test metrics. Runs inside a worker process.
+    """
+    model = model_class(**params)
+    model.fit(X_train, y_train)
+    return model, evaluate(model, X_test, y_test, name)
+
+def default_workers(n_models):
+    return max(1, min(n_models, os.cpu_count() or 1))
+
+def fit_model_zoo(model_classes, params, X_train, y_train, X_test, y_test, evaluate,
+                  n_workers=None, timeout=None, progress=None):
+    """
+    Fit every model in model_classes, concurrently through a process pool when n_workers > 1 or a
+    timeout is set.
+
+    Each model is fitted with the same hyperparameters and random_state as the sequential path,
+    so the returned metrics are identical regardless of worker count.
+    `timeout` is the number of seconds a single model may run once a worker has picked it up; when
+    one overruns, the worker processes still fitting are terminated and TimeoutError is raised.
+    `progress` is called as progress(name, done, total, elapsed_seconds) after each model finishes.
+    Returns (models, metrics), both dicts ordered like model_classes.
+    """
+    names = list(model_classes)
+    n_workers = n_workers or default_workers(len(names))
+    results = {}
+    start = time.perf_counter()
+
+    def report(name):
+        if progress is not None:
+            progress(name, len(results), len(names), time.perf_counter() - start)
+
+    if n_workers == 1 and timeout is None:
+        for name in names:
+            results[name] = fit_and_evaluate(
+                name, model_classes[name], params[name], X_train, y_train, X_test, y_test, evaluate
+            )
+            report(name)
+    else:
+        # A fit cannot be interrupted in-process, so a timeout always runs the models in worker processes
+        started_queue = multiprocessing.Queue()
+        executor = ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker, initargs=(started_queue,))
+        futures = {}
+        workers = {}
+        try:
+            futures = {
+                executor.submit(
+                    fit_in_worker, name, model_classes[name], params[name],
+                    X_train, y_train, X_test, y_test, evaluate
+                ): name
+                for name in names
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures[future]
+                    results[name] = future.result()
+                    report(name)
+
+                # The clock of each model starts when its worker picks it up, not when it is queued
+                while True:
+                    try:
+                        name, pid, started = started_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    workers[name] = (pid, started)
+                if timeout is not None:
+                    now = time.time()
+                    for future in pending:
+                        name = futures[future]
+                        if name in workers and now - workers[name][1] > timeout:
+                            raise TimeoutError(f"{name} did not finish within {timeout} seconds")
+        finally:
+            unfinished = [name for future, name in futures.items() if not future.done()]
+            if unfinished:
+                # On error, drop queued models and stop the workers still fitting instead of leaving them running
+                executor.shutdown(wait=False, cancel_futures=True)
+                for name in unfinished:
+                    if name in workers:
+                        try:
+                            os.kill(workers[name][0], signal.SIGTERM)
+                        except ProcessLookupError:
+                            pass
+            executor.shutdown(wait=True)
+            started_queue.close()
+
+    models = {name: results[name][0] for name in names}
+    metrics = {name: results[name][1] for name in names}
+    return models, metrics
@@ -0,0 +1,238 @@
+import argparse
+import os
+import time
+import numpy as np
+from scipy.special import expit
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from data_loader import DATA_PATH, load_dataset
+
+EXPORT_PATH = os.path.join("artifacts", "tree_export.npz")
+
+# Models in a train_models bundle that can be compiled
+TREE_MODELS = ["Random Forest", "Gradient Boosting", "Decision Tree"]
+
+class ExportedTrees:
+    """
+    Fitted decision trees flattened into a few NumPy arrays, with a vectorized evaluator.
+
+    All trees share one node table: `feature`, `threshold`, `left`, `right` and `value` are indexed by
+    global node id and `roots` holds each tree's first node. Leaves point to themselves. Every row walks
+    down all trees at once, one level per step, for at most `depth` steps.
+
+    `kind` decides how leaf values combine, reproducing the scikit-learn arithmetic exactly:
+    "tree" returns the leaf class fractions, "forest" adds them tree by tree and divides by the number
+    of trees, and "boosting" adds learning_rate * leaf value stage by stage to the init raw prediction
+    and applies the logistic function.
+    """
+
+    def __init__(self, kind, classes, feature, threshold, left, right, value, roots, depth,
+                 learning_rate=1.0, init_raw=0.0):
+        self.kind = kind
+        self.classes_ = np.asarray(classes).astype(str)
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.learning_rate = learning_rate
+        self.init_raw = init_raw
+
+    @classmethod
+    def from_model(cls, model):
+        if isinstance(model, DecisionTreeClassifier):
+            kind, trees, extra = "tree", [model.tree_], {}
+        elif isinstance(model, RandomForestClassifier):
+            kind, trees, extra = "forest", [e.tree_ for e in model.estimators_], {}
+        elif isinstance(model, GradientBoostingClassifier):
+            if model.n_trees_per_iteration_ != 1:
+                raise ValueError("only binary gradient boosting can be exported")
+            # The init estimator's raw prediction is the same for every row
+            init_raw = model._raw_predict_init(np.zeros((1, model.n_features_in_), dtype=np.float32))[0, 0]
+            kind, trees = "boosting", [e.tree_ for e in model.estimators_[:, 0]]
+            extra = {"learning_rate": float(model.learning_rate), "init_raw": float(init_raw)}
+        else:
+            raise TypeError(f"cannot export {type(model).__name__}")
+
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        feature, threshold, left, right, value = [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(leaf, nodes, tree.children_right) + offset)
+            value.append(tree.value[:, 0, :])
+
+        return cls(
+            kind, getattr(model, "classes_", ["bad", "good"]),
+            np.concatenate(feature).astype(np.int32), np.concatenate(threshold).astype(np.float64),
+            np.concatenate(left).astype(np.int32), np.concatenate(right).astype(np.int32),
+            np.concatenate(value).astype(np.float64), offsets[:-1].astype(np.int32),
+            max(tree.max_depth for tree in trees), **extra,
+        )
+
+    def leaves(self, X):
+        """
+        Leaf node id reached by every row in every tree, shape (n_rows, n_trees).
+        """
+        nodes = np.repeat(self.roots[None, :], len(X), axis=0).ravel()
+        # Flat offset of each (row, tree) pair's row in X, so one 1-D gather reads the split feature
+        row_offsets = np.repeat(np.arange(len(X), dtype=np.int64) * X.shape[1], len(self.roots))
+        X_flat = X.ravel()
+        is_leaf = self.left == np.arange(len(self.left))
+
+        # Only pairs still at a split node are stepped, so shallow paths stop costing anything once done
+        active = np.flatnonzero(~is_leaf[nodes])
+        while len(active):
+            current = nodes[active]
+            go_left = X_flat[row_offsets[active] + self.feature[current]] <= self.threshold[current]
+            nodes[active] = np.where(go_left, self.left[current], self.right[current])
+            active = active[~is_leaf[nodes[active]]]
+        return nodes.reshape(len(X), len(self.roots))
+
+    def predict_proba(self, X, block_size=20_000):
+        # Same input conversion as scikit-learn's tree models
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return np.concatenate([self.predict_block(X[start:start + block_size])
+                               for start in range(0, len(X), block_size)]) if len(X) else np.empty((0, 2))
+
+    def predict_block(self, X):
+        values = self.value[self.leaves(X)]
+        if self.kind == "tree":
+            return values[:, 0, :]
+        if self.kind == "forest":
+            # cumsum adds tree by tree from zero, the same order as the forest's accumulation
+            return np.cumsum(values, axis=1)[:, -1, :] / len(self.roots)
+        steps = np.concatenate([np.full((len(X), 1), self.init_raw), self.learning_rate * values[:, :, 0]], axis=1)
+        good = expit(np.cumsum(steps, axis=1)[:, -1])
+        return np.column_stack([1 - good, good])
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def to_arrays(self, prefix):
+        arrays = {name: getattr(self, name) for name in ["feature", "threshold", "left", "right", "value", "roots", "classes_"]}
+        arrays["meta"] = np.array([self.depth, self.learning_rate, self.init_raw])
+        arrays["kind"] = np.array(self.kind)
+        return {f"{prefix}/{name}": array for name, array in arrays.items()}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix):
+        get = lambda name: arrays[f"{prefix}/{name}"]
+        depth, learning_rate, init_raw = get("meta")
+        return cls(str(get("kind")), get("classes_"), get("feature"), get("threshold"), get("left"), get("right"),
+                   get("value"), get("roots"), int(depth), float(learning_rate), float(init_raw))
+
+class LowLatencyModel:
+    """
+    Scores small inputs with the exported trees and larger ones with the original model.
+
+    The NumPy evaluator wins while per-call overhead dominates (a single Random Forest row goes from about
+    11 ms to 0.6 ms), but scikit-learn's compiled traversal is faster on large batches.
+    """
+
+    def __init__(self, model, exported, max_rows=32):
+        self.model = model
+        self.exported = exported
+        self.max_rows = max_rows
+        self.classes_ = model.classes_
+
+    def predict_proba(self, X):
+        if len(X) <= self.max_rows:
+            return self.exported.predict_proba(X)
+        return self.model.predict_proba(X)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+def export_models(bundle, names=TREE_MODELS):
+    return {name: ExportedTrees.from_model(bundle["models"][name]) for name in names if name in bundle["models"]}
+
+def compile_bundle(bundle, max_rows=32):
+    """
+    Copy of a train_models bundle whose tree models score inputs of up to `max_rows` rows through their
+    exports. Probabilities are unchanged; the other models are shared.
+    """
+    compiled = {name: LowLatencyModel(bundle["models"][name], exported, max_rows)
+                for name, exported in export_models(bundle).items()}
+    return {**bundle, "models": {**bundle["models"], **compiled}}
+
+def save_export(exports, path=EXPORT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    arrays = {}
+    for i, (name, exported) in enumerate(exports.items()):
+        arrays.update(exported.to_arrays(str(i)))
+        arrays[f"{i}/name"] = np.array(name)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+def load_export(path=EXPORT_PATH):
+    """
+    Load exported trees without scikit-learn or pickle.
+    """
+    with np.load(path) as arrays:
+        n_models = len([key for key in arrays.files if key.endswith("/name")])
+        return {str(arrays[f"{i}/name"]): ExportedTrees.from_arrays(arrays, str(i)) for i in range(n_models)}
+
+def verify_export(model, exported, X):
+    """
+    Raise AssertionError unless the export gives bit-for-bit the same probabilities as the model on X.
+    """
+    expected = model.predict_proba(X)
+    actual = exported.predict_proba(X)
+    if expected.shape != actual.shape or not np.array_equal(expected, actual):
+        mismatched = int(np.sum(np.any(expected != actual, axis=1))) if expected.shape == actual.shape else len(X)
+        raise AssertionError(f"{type(model).__name__}: {mismatched} of {len(X)} rows differ from scikit-learn")
+
+def time_single_rows(predict_proba, X, repeats=3):
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for i in range(len(X)):
+            predict_proba(X[i:i + 1])
+        best = min(best, time.perf_counter() - start)
+    return best / len(X)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the tree models to flat NumPy arrays, verify them and time them.")
+    parser.add_argument("--train-data", default=DATA_PATH, help="dataset the stored models were trained on")
+    parser.add_argument("--output", default=EXPORT_PATH)
+    parser.add_argument("--batch-rows", type=int, default=100_000, help="rows in the batch timing")
+    args = parser.parse_args(argv)
+
+    # Imported here so loading an export never needs the training stack
+    from credit_risk_model import load_models, split_data
+
+    data = load_dataset(args.train_data)
+    bundle = load_models(data)
+    _, X_train, X_test, _, _ = split_data(data)
+    exports = export_models(bundle)
+    save_export(exports, args.output)
+    exports = load_export(args.output)
+
+    rng = np.random.default_rng(0)
+    X_batch = np.concatenate([X_train, X_test])[rng.integers(0, len(data), args.batch_rows)]
+    for name, exported in exports.items():
+        model = bundle["models"][name]
+        verify_export(model, exported, np.concatenate([X_train, X_test]))
+        verify_export(model, exported, X_batch)
+
+        sk_row = time_single_rows(model.predict_proba, X_test)
+        np_row = time_single_rows(exported.predict_proba, X_test)
+        start = time.perf_counter()
+        model.predict_proba(X_batch)
+        sk_batch = time.perf_counter() - start
+        start = time.perf_counter()
+        exported.predict_proba(X_batch)
+        np_batch = time.perf_counter() - start
+        print(f"{name}: identical probabilities; single row {sk_row * 1000:.3f} -> {np_row * 1000:.3f} ms "
+              f"({sk_row / np_row:.1f}x), {args.batch_rows:,} rows {sk_batch:.2f} -> {np_batch:.2f} s")
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()